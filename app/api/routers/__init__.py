@@ -1,7 +1,8 @@
 """API router aggregator."""
 from fastapi import APIRouter
-from app.api.routers import engagement, health
+from app.api.routers import engagement, health, metrics
 
 api_router = APIRouter()
 api_router.include_router(health.router)
 api_router.include_router(engagement.router)
+api_router.include_router(metrics.router)
@@ -1,17 +1,28 @@
 """HTTP routes for likes, comments, and stats."""
+from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.database import get_db
+from app.db.database import get_db, get_read_db
+from app.core.comment_cache import comment_page_cache, comments_etag, etag_matches
 from app.core.security import get_current_user
+from app.core.serialization import response_class
 from app.core.config import settings
 from app.messaging.publisher import EventPublisher, get_event_publisher
 from app.services.engagement_service import EngagementService
-from app.schemas.like import LikeResponse
+from app.services.trending import trending_tracker
+from app.schemas.like import LikeResponse, LikeLookupRequest, LikeLookupResponse
 from app.schemas.comment import CommentCreate, CommentResponse, CommentListResponse
-from app.schemas.stats import PostStatsResponse
+from app.schemas.stats import (
+    PostStatsResponse,
+    PostStatsBatchRequest,
+    PostStatsBatchResponse,
+    TrendingPost,
+    TrendingResponse,
+)
 
 router = APIRouter(prefix="/posts", tags=["engagement"])
+_render = response_class(settings.response_encoder)
 
 
 def get_engagement_service(
@@ -21,6 +32,14 @@ def get_engagement_service(
     return EngagementService.build(db, publisher)
 
 
+def get_read_engagement_service(
+    db: AsyncSession = Depends(get_read_db),
+    publisher: EventPublisher = Depends(get_event_publisher),
+) -> EngagementService:
+    """Service bound to the read-only session; use only for routes that never write."""
+    return EngagementService.build(db, publisher)
+
+
 @router.post("/{post_id}/like", response_model=LikeResponse, status_code=status.HTTP_201_CREATED)
 async def like_post(
     post_id: UUID,
@@ -66,10 +85,38 @@ async def list_comments(
         le=settings.max_page_size,
         description="Items per page",
     ),
-    service: EngagementService = Depends(get_engagement_service),
+    cursor: Optional[str] = Query(
+        None,
+        description="Opaque cursor from a previous response's next_cursor; overrides page",
+    ),
+    if_none_match: Optional[str] = Header(None),
+    service: EngagementService = Depends(get_read_engagement_service),
 ):
-    """List comments for a post."""
-    return await service.list_comments(post_id, page, page_size)
+    """List comments for a post.
+
+    Responses carry an ETag derived from the post's comment version and the
+    requested page, so ``If-None-Match`` revalidation returns 304 without a
+    database query.
+    """
+    version = service.comments_version(post_id)
+    headers = {
+        "ETag": comments_etag(post_id, version, page, page_size, cursor),
+        "Cache-Control": "no-cache",
+    }
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cache_key = (post_id, version, page_size) if cursor is None and page == 1 else None
+    if cache_key is not None:
+        body = comment_page_cache.get(cache_key)
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers=headers)
+
+    result = await service.list_comments(post_id, page, page_size, cursor)
+    response = _render(result.model_dump(mode="json"), headers=headers)
+    if cache_key is not None:
+        comment_page_cache.put(cache_key, response.body)
+    return response
 
 
 @router.delete("/comments/{comment_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -85,7 +132,50 @@ async def delete_comment(
 @router.get("/{post_id}/stats", response_model=PostStatsResponse)
 async def get_post_stats(
     post_id: UUID,
-    service: EngagementService = Depends(get_engagement_service),
+    service: EngagementService = Depends(get_read_engagement_service),
 ):
     """Fetch aggregated engagement stats for a post."""
     return await service.get_stats(post_id)
+
+
+@router.get("/trending", response_model=TrendingResponse)
+async def get_trending_posts(
+    window: str = Query("1h", description="Trending window, one of TRENDING_WINDOWS"),
+    limit: int = Query(50, ge=1, le=settings.trending_max_limit),
+):
+    """Most engaged posts in a recent window, ranked in memory from engagement events."""
+    if not trending_tracker.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Trending is disabled",
+        )
+    if window not in trending_tracker.windows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unsupported window; use one of {', '.join(trending_tracker.windows)}",
+        )
+    items = [
+        TrendingPost(post_id=post_id, score=score)
+        for post_id, score in trending_tracker.top(window, limit)
+    ]
+    return TrendingResponse(window=window, items=items)
+
+
+@router.post("/stats:batch", response_model=PostStatsBatchResponse)
+async def get_post_stats_batch(
+    payload: PostStatsBatchRequest,
+    service: EngagementService = Depends(get_read_engagement_service),
+):
+    """Fetch engagement stats for several posts in a single query."""
+    items = await service.get_stats_many(payload.post_ids)
+    return PostStatsBatchResponse(items=items)
+
+
+@router.post("/likes:lookup", response_model=LikeLookupResponse)
+async def lookup_likes(
+    payload: LikeLookupRequest,
+    current_user: UUID = Depends(get_current_user),
+    service: EngagementService = Depends(get_read_engagement_service),
+):
+    """Return which of the given posts the current user has liked."""
+    return await service.lookup_likes(current_user, payload.post_ids, payload.include_stats)
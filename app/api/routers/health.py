@@ -1,6 +1,16 @@
 """Health check endpoints."""
 from fastapi import APIRouter, Depends
 from app.messaging.rabbitmq import RabbitMQManager, get_rabbitmq_manager
+from app.messaging.outbox_relay import outbox_relay
+from app.messaging.publisher import stats_change_coalescer
+from app.core.cache import stats_cache
+from app.core.comment_cache import comment_page_cache, comment_versions
+from app.core.like_cache import like_membership_cache
+from app.core.security import token_cache
+from app.db.database import pool_stats
+from app.services.counter_reconciler import counter_reconciler
+from app.services.like_write_buffer import like_write_buffer
+from app.services.trending import trending_tracker
 from app.core.config import settings
 
 router = APIRouter(prefix="/health", tags=["health"])
@@ -27,4 +37,19 @@ async def detailed_health_check(
         "service": settings.service_name,
         "version": settings.service_version,
         "dependencies": {"rabbitmq": "healthy" if rabbit_ok else "unhealthy"},
+        "caches": {
+            "stats": stats_cache.stats(),
+            "likes": like_membership_cache.stats(),
+            "jwt": token_cache.stats(),
+            "comment_versions": comment_versions.stats(),
+            "comment_pages": comment_page_cache.stats(),
+        },
+        "db_pools": pool_stats(),
+        "outbox_relay": outbox_relay.stats(),
+        "publisher": rabbitmq.publisher_pool.stats(),
+        "stats_changed": stats_change_coalescer.stats(),
+        "like_group_commit": like_write_buffer.stats(),
+        "reconciler": counter_reconciler.stats(),
+        "trending": trending_tracker.stats(),
+        "post_consumer": rabbitmq.post_consumer.stats() if rabbitmq.post_consumer else None,
     }
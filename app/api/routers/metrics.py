@@ -0,0 +1,85 @@
+"""Prometheus scrape endpoint."""
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core.cache import stats_cache
+from app.core.comment_cache import comment_page_cache
+from app.core.like_cache import like_membership_cache
+from app.core.metrics import registry
+from app.core.security import token_cache
+from app.messaging.outbox_relay import outbox_relay
+from app.messaging.rabbitmq import rabbitmq_manager
+
+router = APIRouter(tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_CACHES = {
+    "stats": stats_cache,
+    "likes": like_membership_cache,
+    "jwt": token_cache,
+    "comment_pages": comment_page_cache,
+}
+
+
+def _cache_samples(field: str):
+    return [({"cache": name}, getattr(cache, field)) for name, cache in _CACHES.items()]
+
+
+def _consumer_samples(field: str):
+    consumer = rabbitmq_manager.post_consumer
+    if consumer is None:
+        return []
+    return [({"consumer": "post_events"}, getattr(consumer.metrics, field))]
+
+
+registry.callback(
+    "content_cache_hits_total", "Cache lookups served from memory",
+    lambda: _cache_samples("hits"), kind="counter",
+)
+registry.callback(
+    "content_cache_misses_total", "Cache lookups that fell through",
+    lambda: _cache_samples("misses"), kind="counter",
+)
+registry.callback(
+    "content_cache_evictions_total", "Entries evicted to stay within the size bound",
+    lambda: _cache_samples("evictions"), kind="counter",
+)
+registry.callback(
+    "content_cache_entries", "Entries currently cached",
+    lambda: [
+        ({"cache": "stats"}, len(stats_cache)),
+        ({"cache": "likes"}, like_membership_cache.stats()["entries"]),
+        ({"cache": "jwt"}, len(token_cache)),
+        ({"cache": "comment_pages"}, len(comment_page_cache)),
+    ],
+)
+registry.callback(
+    "content_consumer_in_flight", "Messages received but not yet acknowledged",
+    lambda: _consumer_samples("in_flight"),
+)
+registry.callback(
+    "content_consumer_processed_total", "Messages handled successfully",
+    lambda: _consumer_samples("processed"), kind="counter",
+)
+registry.callback(
+    "content_consumer_failed_total", "Messages whose handler raised",
+    lambda: _consumer_samples("failed"), kind="counter",
+)
+registry.callback(
+    "content_outbox_published_total", "Outbox events delivered to the broker",
+    lambda: [({}, outbox_relay.published)], kind="counter",
+)
+registry.callback(
+    "content_outbox_failed_total", "Outbox delivery attempts that failed",
+    lambda: [({}, outbox_relay.failed)], kind="counter",
+)
+registry.callback(
+    "content_outbox_exhausted_total", "Outbox events parked after OUTBOX_MAX_ATTEMPTS failures",
+    lambda: [({}, outbox_relay.exhausted)], kind="counter",
+)
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics() -> PlainTextResponse:
+    """Render all registered metrics in the Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
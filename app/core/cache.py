@@ -0,0 +1,88 @@
+"""In-process LRU cache with per-entry TTL."""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+from app.core.config import settings
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """Bounded LRU cache whose entries expire after a fixed TTL.
+
+    Not thread-safe; intended for use from a single event loop.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float, enabled: bool = True) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled and max_size > 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value or None when missing or expired."""
+        if not self.enabled:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: V, ttl_seconds: Optional[float] = None) -> None:
+        """Insert or replace a value, evicting the least recently used entry when full.
+
+        ``ttl_seconds`` shortens the cache-wide TTL for this entry.
+        """
+        if not self.enabled:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return counters used for sizing the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+# Post stats keyed by post_id; values are PostStatsResponse instances
+stats_cache: TTLCache = TTLCache(
+    max_size=settings.stats_cache_max_size,
+    ttl_seconds=settings.stats_cache_ttl_seconds,
+    enabled=settings.stats_cache_enabled,
+)
@@ -0,0 +1,67 @@
+"""Per-post comment versions for ETags, and a cache of serialized first pages."""
+import itertools
+import zlib
+from typing import Optional
+from uuid import UUID
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class CommentVersions:
+    """In-memory version number per post, changed whenever its comments change.
+
+    Versions come from one process-wide counter, so a post that is evicted or
+    expires gets a number it never had before instead of restarting at 0; a
+    stale ETag can therefore never match again. Expiry bounds how long a missed
+    cross-replica invalidation can keep serving 304s.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self._versions: TTLCache = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._counter = itertools.count(1)
+
+    def current(self, post_id: UUID) -> int:
+        version = self._versions.get(post_id)
+        if version is None:
+            version = next(self._counter)
+            self._versions.put(post_id, version)
+        return version
+
+    def bump(self, post_id: UUID) -> int:
+        version = next(self._counter)
+        self._versions.put(post_id, version)
+        return version
+
+    def stats(self):
+        return self._versions.stats()
+
+
+def comments_etag(
+    post_id: UUID, version: int, page: int, page_size: int, cursor: Optional[str] = None
+) -> str:
+    """Validator for one page of a post's comments at ``version``."""
+    # The instance id keeps versions from different replicas from ever colliding;
+    # the page hash keeps different pages of one post from sharing a validator
+    page_hash = zlib.crc32(f"{page}:{page_size}:{cursor or ''}".encode())
+    return f'"{post_id.hex[:12]}-{settings.instance_id[:12]}-{version}-{page_hash:08x}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an ``If-None-Match`` header (weak comparison) against ``etag``."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+comment_versions = CommentVersions(
+    max_size=settings.comments_version_max_size,
+    ttl_seconds=settings.comments_version_ttl_seconds,
+)
+
+# Serialized first pages keyed by (post_id, version, page_size)
+comment_page_cache: TTLCache = TTLCache(
+    max_size=settings.comments_page_cache_max_size,
+    ttl_seconds=settings.comments_version_ttl_seconds,
+    enabled=settings.comments_page_cache_enabled,
+)
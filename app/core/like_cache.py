@@ -0,0 +1,191 @@
+"""In-process cache of which posts recently active users have liked."""
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Set
+from uuid import UUID
+from app.core.config import settings
+
+_UUID_BYTES = 16
+
+
+class UserLikeSet:
+    """Exact set of post IDs stored as one sorted ``bytes`` of 16-byte UUIDs.
+
+    Roughly 16 bytes per like versus ~150 for a Python ``set`` of ``UUID``;
+    membership is a binary search.
+    """
+
+    __slots__ = ("_data", "expires_at")
+
+    def __init__(self, post_ids: Iterable[UUID], expires_at: float) -> None:
+        self._data = b"".join(sorted(post_id.bytes for post_id in post_ids))
+        self.expires_at = expires_at
+
+    def __len__(self) -> int:
+        return len(self._data) // _UUID_BYTES
+
+    def _search(self, key: bytes) -> int:
+        """Return the index of the first element >= key."""
+        low, high = 0, len(self)
+        data = self._data
+        while low < high:
+            mid = (low + high) // 2
+            offset = mid * _UUID_BYTES
+            if data[offset:offset + _UUID_BYTES] < key:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def __contains__(self, post_id: UUID) -> bool:
+        key = post_id.bytes
+        index = self._search(key)
+        offset = index * _UUID_BYTES
+        return self._data[offset:offset + _UUID_BYTES] == key
+
+    def add(self, post_id: UUID) -> None:
+        key = post_id.bytes
+        offset = self._search(key) * _UUID_BYTES
+        if self._data[offset:offset + _UUID_BYTES] != key:
+            self._data = self._data[:offset] + key + self._data[offset:]
+
+    def discard(self, post_id: UUID) -> None:
+        key = post_id.bytes
+        offset = self._search(key) * _UUID_BYTES
+        if self._data[offset:offset + _UUID_BYTES] == key:
+            self._data = self._data[:offset] + self._data[offset + _UUID_BYTES:]
+
+
+class LikeMembershipCache:
+    """LRU of per-user like sets bounded by the total number of cached likes.
+
+    Users with more than ``max_per_user`` likes are never cached and always fall
+    back to the database. Writes on this instance update sets in place; writes on
+    other instances arrive as invalidations. To avoid caching a set loaded before a
+    concurrent write, loads are stamped with an epoch and discarded if the user was
+    mutated after the load started.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_per_user: int,
+        ttl_seconds: float,
+        enabled: bool = True,
+        mutation_window: int = 10_000,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_per_user = max_per_user
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled and max_entries > 0
+        self.mutation_window = mutation_window
+        self._users: "OrderedDict[UUID, UserLikeSet]" = OrderedDict()
+        self._entries = 0
+        self._epoch = 0
+        self._recent_mutations: "OrderedDict[UUID, int]" = OrderedDict()
+        self._forgotten_epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _mutated(self, user_id: UUID) -> None:
+        self._epoch += 1
+        self._recent_mutations[user_id] = self._epoch
+        self._recent_mutations.move_to_end(user_id)
+        while len(self._recent_mutations) > self.mutation_window:
+            _, epoch = self._recent_mutations.popitem(last=False)
+            self._forgotten_epoch = max(self._forgotten_epoch, epoch)
+
+    def _remove(self, user_id: UUID) -> None:
+        likes = self._users.pop(user_id, None)
+        if likes is not None:
+            self._entries -= len(likes)
+
+    def liked_subset(self, user_id: UUID, post_ids: Iterable[UUID]) -> Optional[Set[UUID]]:
+        """Return the liked subset of ``post_ids``, or None when the user is not cached."""
+        if not self.enabled:
+            return None
+        likes = self._users.get(user_id)
+        if likes is None or likes.expires_at <= time.monotonic():
+            if likes is not None:
+                self._remove(user_id)
+            self.misses += 1
+            return None
+        self._users.move_to_end(user_id)
+        self.hits += 1
+        return {post_id for post_id in post_ids if post_id in likes}
+
+    def begin_load(self) -> int:
+        """Return a token to pass to ``store`` after reading the user's likes."""
+        return self._epoch
+
+    def store(self, user_id: UUID, post_ids: Iterable[UUID], token: int) -> bool:
+        """Cache a user's full like set unless it is too large or went stale while loading."""
+        if not self.enabled:
+            return False
+        mutated_at = self._recent_mutations.get(user_id, self._forgotten_epoch)
+        if mutated_at > token:
+            return False
+        likes = UserLikeSet(post_ids, time.monotonic() + self.ttl_seconds)
+        if len(likes) > self.max_per_user:
+            return False
+        self._remove(user_id)
+        self._users[user_id] = likes
+        self._entries += len(likes)
+        while self._entries > self.max_entries and self._users:
+            _, evicted = self._users.popitem(last=False)
+            self._entries -= len(evicted)
+            self.evictions += 1
+        return True
+
+    def record_like(self, user_id: UUID, post_id: UUID) -> None:
+        self._mutated(user_id)
+        likes = self._users.get(user_id)
+        if likes is None:
+            return
+        if post_id not in likes:
+            likes.add(post_id)
+            self._entries += 1
+        if len(likes) > self.max_per_user:
+            self._remove(user_id)
+
+    def record_unlike(self, user_id: UUID, post_id: UUID) -> None:
+        self._mutated(user_id)
+        likes = self._users.get(user_id)
+        if likes is not None and post_id in likes:
+            likes.discard(post_id)
+            self._entries -= 1
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        self._mutated(user_id)
+        self._remove(user_id)
+
+    def forget_post(self, post_id: UUID) -> None:
+        """Drop a deleted post from every cached user."""
+        for user_id, likes in self._users.items():
+            if post_id in likes:
+                likes.discard(post_id)
+                self._entries -= 1
+                self._mutated(user_id)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "users": len(self._users),
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+            "approx_bytes": self._entries * _UUID_BYTES,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+like_membership_cache = LikeMembershipCache(
+    max_entries=settings.like_cache_max_entries,
+    max_per_user=settings.like_cache_max_per_user,
+    ttl_seconds=settings.like_cache_ttl_seconds,
+    enabled=settings.like_cache_enabled,
+)
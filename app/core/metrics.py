@@ -0,0 +1,187 @@
+"""Lightweight in-process metrics with Prometheus text exposition."""
+import bisect
+import functools
+import inspect
+import time
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond up to pool/broker timeouts
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+Sample = Tuple[Dict[str, str], float]
+
+
+class _HistogramChild:
+    __slots__ = ("buckets", "_counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Return (upper bound, cumulative count) pairs ending with +Inf."""
+        pairs = []
+        running = 0
+        for bound, count in zip((*self.buckets, float("inf")), self._counts):
+            running += count
+            pairs.append((bound, running))
+        return pairs
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": {str(bound): count for bound, count in self.cumulative()},
+        }
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics) with optional labels."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._children: Dict[Tuple[str, ...], _HistogramChild] = {}
+
+    def labels(self, *values: str) -> _HistogramChild:
+        child = self._children.get(values)
+        if child is None:
+            child = self._children[values] = _HistogramChild(self.buckets)
+        return child
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        self.labels(*labelvalues).observe(value)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        for values, child in self._children.items():
+            labels = dict(zip(self.labelnames, values))
+            for bound, count in child.cumulative():
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_labels({**labels, 'le': le})} {count}")
+            lines.append(f"{self.name}_sum{_labels(labels)} {child.sum}")
+            lines.append(f"{self.name}_count{_labels(labels)} {child.count}")
+        return lines
+
+
+class CallbackMetric:
+    """Gauge or counter whose samples are read from a callback at scrape time."""
+
+    def __init__(
+        self, name: str, description: str, kind: str, collect: Callable[[], Iterable[Sample]]
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.kind = kind
+        self.collect = collect
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        for labels, value in self.collect():
+            lines.append(f"{self.name}{_labels(labels)} {float(value)}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items()) + "}"
+
+
+class Registry:
+    """Collection of metrics rendered together by the /metrics endpoint."""
+
+    def __init__(self) -> None:
+        self._metrics: List[Any] = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, description: str, labelnames: Sequence[str] = ()) -> Histogram:
+        return self.register(Histogram(name, description, labelnames))
+
+    def callback(
+        self,
+        name: str,
+        description: str,
+        collect: Callable[[], Iterable[Sample]],
+        kind: str = "gauge",
+    ) -> CallbackMetric:
+        return self.register(CallbackMetric(name, description, kind, collect))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            try:
+                lines.extend(metric.render())
+            except Exception:  # noqa: BLE001 - one broken collector must not hide the rest
+                continue
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_seconds = registry.histogram(
+    "content_http_request_duration_seconds",
+    "HTTP request latency by route template, method and status",
+    ("route", "method", "status"),
+)
+operation_seconds = registry.histogram(
+    "content_operation_duration_seconds",
+    "Latency of service, repository and messaging operations",
+    ("layer", "operation"),
+)
+
+
+def timed(layer: str, operation: str):
+    """Decorator recording the duration of a coroutine function."""
+
+    def decorator(func):
+        child = operation_seconds.labels(layer, operation)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                child.observe(time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+def instrument(layer: str):
+    """Class decorator timing every public coroutine method as ``<Class>.<method>``."""
+
+    def decorator(cls):
+        for name, member in list(vars(cls).items()):
+            if name.startswith("_") or not inspect.iscoroutinefunction(member):
+                continue
+            setattr(cls, name, timed(layer, f"{cls.__name__}.{name}")(member))
+        return cls
+
+    return decorator
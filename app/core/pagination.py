@@ -0,0 +1,20 @@
+"""Opaque cursor tokens for keyset pagination."""
+import base64
+from datetime import datetime
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    """Encode a (created_at, id) keyset position as an opaque URL-safe token."""
+    raw = f"{created_at.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple[datetime, UUID]:
+    """Decode a token produced by ``encode_cursor``; raises ValueError when malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, item_id = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(item_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
@@ -1,14 +1,50 @@
 """Security utilities for JWT validation."""
+import hashlib
+import logging
+import time
 from typing import Dict, Any
 from uuid import UUID
 from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.core.cache import TTLCache
 from app.core.config import settings
 
+try:  # PyJWT decodes noticeably faster than python-jose when installed
+    import jwt as pyjwt
+except ImportError:  # pragma: no cover - optional dependency
+    pyjwt = None
+
+logger = logging.getLogger(__name__)
+
 # Bearer scheme for dependency injection
 http_bearer = HTTPBearer(auto_error=True)
 
+# Verified user IDs keyed by SHA-256 of the token, kept until the token's exp
+token_cache: TTLCache = TTLCache(
+    max_size=settings.jwt_cache_max_size,
+    ttl_seconds=settings.jwt_cache_max_ttl_seconds,
+    enabled=settings.jwt_cache_enabled,
+)
+
+
+_JWT_BACKENDS = ("auto", "pyjwt", "jose")
+
+
+def _use_pyjwt() -> bool:
+    if settings.jwt_backend not in _JWT_BACKENDS:
+        raise ValueError(
+            f"Invalid JWT_BACKEND {settings.jwt_backend!r}; expected one of {', '.join(_JWT_BACKENDS)}"
+        )
+    if settings.jwt_backend == "jose":
+        return False
+    if settings.jwt_backend == "pyjwt" and pyjwt is None:
+        logger.warning("JWT_BACKEND=pyjwt but PyJWT is not installed; using python-jose")
+    return pyjwt is not None
+
+
+_USE_PYJWT = _use_pyjwt()
+
 
 def decode_access_token(token: str) -> Dict[str, Any]:
     """Decode and validate JWT access token using HS256."""
@@ -19,22 +55,51 @@ def decode_access_token(token: str) -> Dict[str, Any]:
     )
 
     try:
-        payload = jwt.decode(
-            token,
-            settings.jwt_secret_key,
-            algorithms=[settings.jwt_algorithm],
-        )
+        if _USE_PYJWT:
+            payload = pyjwt.decode(
+                token,
+                settings.jwt_secret_key,
+                algorithms=[settings.jwt_algorithm],
+            )
+        else:
+            payload = jwt.decode(
+                token,
+                settings.jwt_secret_key,
+                algorithms=[settings.jwt_algorithm],
+            )
         user_id: str = payload.get("sub")
         if user_id is None:
             raise credentials_exception
         return payload
     except JWTError:
         raise credentials_exception
+    except Exception as exc:  # noqa: BLE001
+        if pyjwt is not None and isinstance(exc, pyjwt.PyJWTError):
+            raise credentials_exception
+        raise
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(http_bearer),
 ) -> UUID:
-    """Extract current user ID from JWT bearer token."""
-    payload = decode_access_token(credentials.credentials)
-    return UUID(str(payload.get("sub")))
+    """Extract current user ID from JWT bearer token.
+
+    Async so it runs on the event loop: ``token_cache`` is not thread-safe, and
+    HS256 verification is cheap enough not to need the threadpool.
+    """
+    token = credentials.credentials
+    key = hashlib.sha256(token.encode()).digest()
+    cached = token_cache.get(key)
+    if cached is not None:
+        return cached
+
+    payload = decode_access_token(token)
+    user_id = UUID(str(payload.get("sub")))
+    exp = payload.get("exp")
+    if exp is not None:
+        remaining = float(exp) - time.time()
+        if remaining > 0:
+            token_cache.put(key, user_id, ttl_seconds=remaining)
+    else:
+        token_cache.put(key, user_id)
+    return user_id
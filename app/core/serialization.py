@@ -0,0 +1,81 @@
+"""Pluggable JSON encoders for broker messages and HTTP responses."""
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict
+from uuid import UUID
+from fastapi.responses import JSONResponse
+
+try:  # orjson encodes UUIDs and datetimes natively, ~5-10x faster than json
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None
+
+logger = logging.getLogger(__name__)
+
+Encoder = Callable[[Any], bytes]
+Decoder = Callable[[bytes], Any]
+
+
+def _default(value: Any) -> Any:
+    """Handle the types event payloads carry without a generic ``str()`` call."""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _json_encode(value: Any) -> bytes:
+    return json.dumps(value, default=_default, separators=(",", ":")).encode()
+
+
+ENCODERS: Dict[str, Encoder] = {"json": _json_encode}
+DECODERS: Dict[str, Decoder] = {"json": json.loads}
+
+if orjson is not None:
+    ENCODERS["orjson"] = lambda value: orjson.dumps(value, default=_default)
+    DECODERS["orjson"] = orjson.loads
+
+if msgspec is not None:
+    _msgspec_encoder = msgspec.json.Encoder(enc_hook=_default)
+    ENCODERS["msgspec"] = _msgspec_encoder.encode
+    DECODERS["msgspec"] = msgspec.json.decode
+
+# Preference order for "auto", fastest first
+_PREFERRED = ("orjson", "msgspec", "json")
+
+
+def resolve_encoder_name(name: str) -> str:
+    """Map a configured backend (or ``auto``) to an installed one."""
+    if name == "auto":
+        return next(candidate for candidate in _PREFERRED if candidate in ENCODERS)
+    if name not in ENCODERS:
+        logger.warning("JSON backend %r is not installed; using json", name)
+        return "json"
+    return name
+
+
+def get_encoder(name: str) -> Encoder:
+    return ENCODERS[resolve_encoder_name(name)]
+
+
+def get_decoder(name: str) -> Decoder:
+    return DECODERS[resolve_encoder_name(name)]
+
+
+def response_class(name: str) -> type[JSONResponse]:
+    """Return the default FastAPI response class for the configured backend."""
+    if resolve_encoder_name(name) == "orjson":
+        from fastapi.responses import ORJSONResponse
+
+        return ORJSONResponse
+    return JSONResponse
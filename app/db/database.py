@@ -1,14 +1,133 @@
 """Database connection and session management for Content Service."""
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import time
+from typing import Any, Dict
+from uuid import uuid4
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import settings
+from app.core.metrics import registry
+
+
+def _async_url(url: str) -> str:
+    return url.replace("postgresql://", "postgresql+asyncpg://")
+
+
+pool_wait_seconds = registry.histogram(
+    "content_db_pool_wait_seconds",
+    "Time spent waiting to check out a pooled connection",
+    ("role",),
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    role = "primary"
+    timeouts = 0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            type(self).timeouts += 1
+            raise
+        finally:
+            pool_wait_seconds.observe(time.perf_counter() - started, self.role)
+
+
+def _pool_class(role: str) -> type:
+    return type(f"InstrumentedPool_{role}", (InstrumentedPool,), {"role": role, "timeouts": 0})
+
+
+def _connect_args() -> Dict[str, Any]:
+    if settings.db_pgbouncer_mode:
+        # Transaction-mode PgBouncer cannot keep prepared statements or startup settings.
+        # asyncpg still prepares every query under a name; make the names unique so
+        # server connections shared between clients never see a duplicate.
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    args: Dict[str, Any] = {
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+    }
+    if settings.db_statement_timeout_ms > 0:
+        args["server_settings"] = {"statement_timeout": str(settings.db_statement_timeout_ms)}
+    return args
+
+
+def _create_engine(url: str, role: str) -> AsyncEngine:
+    return create_async_engine(
+        _async_url(url),
+        echo=settings.debug,
+        future=True,
+        poolclass=_pool_class(role),
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args=_connect_args(),
+    )
+
 
 # Create async engine for PostgreSQL with asyncpg driver
-engine = create_async_engine(
-    settings.database_url.replace("postgresql://", "postgresql+asyncpg://"),
-    echo=settings.debug,
-    future=True,
+engine = _create_engine(settings.database_url, "primary")
+
+# Read-only engine; falls back to the primary when no replica is configured
+read_engine = (
+    _create_engine(settings.database_read_url, "replica")
+    if settings.database_read_url
+    else engine
+)
+
+
+def _engines() -> Dict[str, AsyncEngine]:
+    engines = {"primary": engine}
+    if read_engine is not engine:
+        engines["replica"] = read_engine
+    return engines
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Return checkout/overflow gauges and wait histograms per engine."""
+    stats = {}
+    for role, current in _engines().items():
+        pool = current.pool
+        stats[role] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "timeouts": type(pool).timeouts,
+            "wait_seconds": pool_wait_seconds.labels(role).snapshot(),
+        }
+    return stats
+
+
+def _pool_samples(field: str):
+    return lambda: [({"role": role}, stats[field]) for role, stats in pool_stats().items()]
+
+
+registry.callback("content_db_pool_size", "Configured pool size", _pool_samples("size"))
+registry.callback(
+    "content_db_pool_checked_out", "Connections currently checked out", _pool_samples("checked_out")
+)
+registry.callback(
+    "content_db_pool_overflow", "Overflow connections in use", _pool_samples("overflow")
 )
+registry.callback(
+    "content_db_pool_timeouts_total",
+    "Checkouts that timed out waiting for a connection",
+    _pool_samples("timeouts"),
+    kind="counter",
+)
+
 
 # Create async session factory
 async_session = sessionmaker(
@@ -19,8 +138,23 @@ async_session = sessionmaker(
     autoflush=False,
 )
 
+# Session factory for read-only queries (replica when configured)
+async_read_session = sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autocommit=False,
+    autoflush=False,
+)
+
 
 async def get_db() -> AsyncSession:
     """Dependency to get a database session."""
     async with async_session() as session:
         yield session
+
+
+async def get_read_db() -> AsyncSession:
+    """Dependency to get a read-only database session."""
+    async with async_read_session() as session:
+        yield session
@@ -1,15 +1,27 @@
 """Main FastAPI application for Content Service."""
 import logging
+import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routers import api_router
+from app.core.cache import stats_cache
+from app.core.comment_cache import comment_versions
+from app.core.like_cache import like_membership_cache
 from app.core.config import settings
+from app.core.metrics import http_request_seconds, timed
+from app.core.serialization import response_class
 from app.db.database import async_session
 from app.messaging.rabbitmq import rabbitmq_manager
-from app.messaging.publisher import event_publisher
-from app.messaging.events import PostCreatedEvent, PostDeletedEvent
+from app.messaging.publisher import event_publisher, stats_change_coalescer
+from app.messaging.outbox_relay import outbox_relay
+from app.messaging.events import PostCreatedEvent, PostDeletedEvent, StatsInvalidatedEvent
 from app.services.engagement_service import EngagementService
+from app.services.counter_compactor import like_counter_compactor
+from app.services.counter_reconciler import counter_reconciler
+from app.services.like_write_buffer import like_write_buffer
+from app.services.post_purger import post_purger
+from app.services.trending import trending_tracker
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,6 +30,7 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@timed("consumer", "post_event")
 async def _handle_post_event(routing_key: str, payload: dict) -> None:
     """Dispatch post lifecycle events to handlers."""
     async with async_session() as session:
@@ -32,18 +45,78 @@ async def _handle_post_event(routing_key: str, payload: dict) -> None:
             logger.warning("Unhandled routing key: %s", routing_key)
 
 
+@timed("consumer", "post_created_batch")
+async def _handle_post_created_batch(payloads: list[dict]) -> None:
+    """Initialize stats rows for a batch of post.created events in one statement."""
+    post_ids = [PostCreatedEvent(**payload).post_id for payload in payloads]
+    async with async_session() as session:
+        service = EngagementService.build(session, event_publisher)
+        await service.handle_posts_created(post_ids)
+
+
+async def _handle_stats_invalidated(routing_key: str, payload: dict) -> None:
+    """Drop cached stats, like sets and comment versions changed by another replica."""
+    event = StatsInvalidatedEvent(**payload)
+    if event.origin != settings.instance_id:
+        stats_cache.invalidate(event.post_id)
+        if event.user_id is not None:
+            like_membership_cache.invalidate_user(event.user_id)
+        if event.comments_changed:
+            comment_versions.bump(event.post_id)
+
+
+async def _handle_trending_event(routing_key: str, payload: dict) -> None:
+    """Feed likes and comments committed on any replica into the trending ranking."""
+    if routing_key == settings.post_deleted_routing_key:
+        trending_tracker.forget(PostDeletedEvent(**payload).post_id)
+    else:
+        trending_tracker.record_event(routing_key, payload)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage startup and shutdown hooks."""
     logger.info("Starting Content Service...")
+    if settings.like_counter_shards > 0:
+        like_counter_compactor.start()
+        logger.info("Like counter compactor started (%s shards)", settings.like_counter_shards)
+    if trending_tracker.enabled:
+        try:
+            # Before the consumer starts, so live events land on top of the checkpoint
+            loaded = await trending_tracker.warm_up()
+            logger.info("Trending warmed up from %s checkpointed buckets", loaded)
+        except Exception:  # noqa: BLE001
+            logger.exception("Trending warm-up failed; starting empty")
     try:
         await rabbitmq_manager.connect_with_retry()
-        await rabbitmq_manager.start_post_consumer(_handle_post_event)
+        await rabbitmq_manager.start_post_consumer(
+            _handle_post_event,
+            batch_handlers={settings.post_created_routing_key: _handle_post_created_batch},
+        )
+        await rabbitmq_manager.start_invalidation_consumer(_handle_stats_invalidated)
+        if trending_tracker.enabled:
+            await rabbitmq_manager.start_trending_consumer(
+                _handle_trending_event, trending_tracker.routing_keys
+            )
         logger.info("RabbitMQ consumer started")
     except Exception:  # noqa: BLE001
         logger.exception("RabbitMQ startup failed; continuing without consumer")
+    # Runs even without a broker so events accumulate in the outbox until it returns
+    outbox_relay.start()
+    post_purger.start()
+    stats_change_coalescer.start()
+    trending_tracker.start()
+    if settings.reconcile_enabled:
+        counter_reconciler.start()
     yield
     logger.info("Shutting down Content Service...")
+    await like_write_buffer.stop()
+    await counter_reconciler.stop()
+    await stats_change_coalescer.stop()
+    await trending_tracker.stop()
+    await post_purger.stop()
+    await outbox_relay.stop()
+    await like_counter_compactor.stop()
     try:
         await rabbitmq_manager.disconnect()
     except Exception:  # noqa: BLE001
@@ -55,6 +128,7 @@ app = FastAPI(
     version=settings.service_version,
     description="Content Service - Likes, comments, and engagement counters",
     lifespan=lifespan,
+    default_response_class=response_class(settings.response_encoder),
 )
 
 app.add_middleware(
@@ -65,6 +139,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """Observe request latency labelled by route template rather than raw path."""
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        http_request_seconds.observe(
+            time.perf_counter() - started,
+            getattr(route, "path", "unmatched"),
+            request.method,
+            str(status_code),
+        )
+
+
 app.include_router(api_router)
 
 
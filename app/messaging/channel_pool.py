@@ -0,0 +1,116 @@
+"""Pool of confirm-mode channels used for publishing."""
+import asyncio
+import itertools
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from aio_pika import ExchangeType, Message
+from aio_pika.abc import AbstractChannel, AbstractConnection, AbstractExchange
+
+
+class PublishSkipped(Exception):
+    """Not sent because an earlier message of the same ordered batch failed."""
+
+
+class _PublisherChannel:
+    """One confirm-mode channel with a bounded number of unconfirmed publishes."""
+
+    def __init__(self, channel: AbstractChannel, exchange: AbstractExchange, window: int) -> None:
+        self.channel = channel
+        self.exchange = exchange
+        self.window = asyncio.Semaphore(window)
+        self.outstanding = 0
+
+    async def publish(
+        self, message: Message, routing_key: str, failed: Optional[asyncio.Event] = None
+    ) -> None:
+        """Publish and wait for the confirm; with ``failed``, skip once it is set and set it on error."""
+        async with self.window:
+            if failed is not None and failed.is_set():
+                raise PublishSkipped(routing_key)
+            self.outstanding += 1
+            try:
+                await self.exchange.publish(message, routing_key=routing_key)
+            except Exception:
+                if failed is not None:
+                    failed.set()
+                raise
+            finally:
+                self.outstanding -= 1
+
+
+class PublisherChannelPool:
+    """Spreads publishes over several channels, each pipelining up to ``window`` confirms.
+
+    A single channel would serialise every publishing coroutine; here callers
+    are assigned channels round-robin, and each channel keeps up to ``window``
+    messages in flight while waiting for broker confirms. Messages
+    published with the same ``ordering_key`` always use the same channel and are
+    written to it in call order.
+    """
+
+    def __init__(self, exchange_name: str, size: int, window: int) -> None:
+        self.exchange_name = exchange_name
+        self.size = max(size, 1)
+        self.window = max(window, 1)
+        self._channels: List[_PublisherChannel] = []
+        self._next = itertools.cycle(range(self.size))
+
+    async def open(self, connection: AbstractConnection) -> None:
+        self._channels = []
+        for _ in range(self.size):
+            channel = await connection.channel(publisher_confirms=True)
+            exchange = await channel.declare_exchange(
+                self.exchange_name,
+                ExchangeType.TOPIC,
+                durable=True,
+            )
+            self._channels.append(_PublisherChannel(channel, exchange, self.window))
+
+    async def close(self) -> None:
+        channels, self._channels = self._channels, []
+        for publisher in channels:
+            if not publisher.channel.is_closed:
+                await publisher.channel.close()
+
+    def _pick(self, ordering_key: Optional[str]) -> _PublisherChannel:
+        if not self._channels:
+            raise RuntimeError("Publisher channels are not open")
+        if ordering_key is None:
+            return self._channels[next(self._next) % len(self._channels)]
+        return self._channels[zlib.crc32(ordering_key.encode()) % len(self._channels)]
+
+    async def publish(
+        self, message: Message, routing_key: str, ordering_key: Optional[str] = None
+    ) -> None:
+        """Publish one message and wait for its broker confirm."""
+        await self._pick(ordering_key).publish(message, routing_key)
+
+    async def publish_many(
+        self, messages: Sequence[Tuple[Message, str]], ordering_key: Optional[str] = None
+    ) -> List[Optional[BaseException]]:
+        """Pipeline ``messages`` and return one error (or None) per message, in order.
+
+        With an ``ordering_key`` every message goes to the same channel in order,
+        and once one fails the messages not yet written are skipped with
+        ``PublishSkipped``; those already in flight may still be confirmed.
+        Otherwise messages are spread over the pool.
+        """
+        if ordering_key is not None:
+            publisher = self._pick(ordering_key)
+            failed = asyncio.Event()
+            tasks = [publisher.publish(message, routing_key, failed) for message, routing_key in messages]
+        else:
+            tasks = [self.publish(message, routing_key) for message, routing_key in messages]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        return [result if isinstance(result, BaseException) else None for result in results]
+
+    def healthy(self) -> bool:
+        return bool(self._channels) and all(not publisher.channel.is_closed for publisher in self._channels)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "channels": len(self._channels),
+            "window": self.window,
+            "outstanding": sum(publisher.outstanding for publisher in self._channels),
+            "closed": sum(1 for publisher in self._channels if publisher.channel.is_closed),
+        }
@@ -0,0 +1,230 @@
+"""Concurrent message processing with per-key ordering."""
+import asyncio
+import json
+import logging
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from aio_pika.abc import AbstractIncomingMessage
+
+logger = logging.getLogger(__name__)
+BatchHandler = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+Decoder = Callable[[bytes], Any]
+
+
+class ConsumerMetrics:
+    """Counters for a consumer; throughput is averaged over the last ``window_seconds``.
+
+    Processed messages are counted into per-second buckets as they complete, so
+    ``stats()`` only reads and any number of scrapers see the same rate.
+    """
+
+    def __init__(self, window_seconds: int = 10) -> None:
+        self.in_flight = 0
+        self.processed = 0
+        self.failed = 0
+        self.last_queue_wait_seconds = 0.0
+        self.last_delivery_lag_seconds: Optional[float] = None
+        self.window_seconds = max(window_seconds, 1)
+        self._seconds = [-1] * self.window_seconds
+        self._counts = [0] * self.window_seconds
+
+    def record_processed(self, count: int = 1) -> None:
+        self.processed += count
+        second = int(time.monotonic())
+        slot = second % self.window_seconds
+        if self._seconds[slot] != second:
+            self._seconds[slot] = second
+            self._counts[slot] = 0
+        self._counts[slot] += count
+
+    def throughput(self) -> float:
+        current = int(time.monotonic())
+        recent = sum(
+            count
+            for second, count in zip(self._seconds, self._counts)
+            if current - self.window_seconds < second <= current
+        )
+        return recent / self.window_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "processed": self.processed,
+            "failed": self.failed,
+            "throughput_per_second": self.throughput(),
+            "last_queue_wait_seconds": self.last_queue_wait_seconds,
+            "last_delivery_lag_seconds": self.last_delivery_lag_seconds,
+        }
+
+
+class MessageBatcher:
+    """Accumulates messages for one routing key and handles them as a batch.
+
+    A batch is flushed when it reaches ``max_messages`` or ``max_wait_seconds``
+    after its first message, whichever comes first. Messages are acked together
+    once the batch handler succeeds; if it fails, each message is retried through
+    the per-message handler so one bad event does not drop the whole batch.
+    """
+
+    def __init__(
+        self,
+        batch_handler: BatchHandler,
+        fallback,
+        metrics: ConsumerMetrics,
+        max_messages: int,
+        max_wait_seconds: float,
+    ) -> None:
+        self.batch_handler = batch_handler
+        self.fallback = fallback
+        self.metrics = metrics
+        self.max_messages = max_messages
+        self.max_wait_seconds = max_wait_seconds
+        self._pending: List[Tuple[AbstractIncomingMessage, Dict[str, Any]]] = []
+        self._timer: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    async def add(self, message: AbstractIncomingMessage, payload: Dict[str, Any]) -> None:
+        self._pending.append((message, payload))
+        if len(self._pending) >= self.max_messages:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_wait_seconds)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if self._timer is not None and self._timer is not asyncio.current_task():
+                self._timer.cancel()
+                self._timer = None
+            if not batch:
+                return
+            try:
+                await self.batch_handler([payload for _, payload in batch])
+                self.metrics.record_processed(len(batch))
+            except Exception:  # noqa: BLE001
+                logger.exception("Batch of %s post events failed; retrying one by one", len(batch))
+                for message, payload in batch:
+                    try:
+                        await self.fallback(message.routing_key, payload)
+                        self.metrics.record_processed()
+                    except Exception as exc:  # noqa: BLE001
+                        self.metrics.failed += 1
+                        logger.exception("Failed to process post event: %s", exc)
+            for message, _ in batch:
+                try:
+                    await message.ack()
+                except Exception:  # noqa: BLE001
+                    logger.exception("Failed to acknowledge post event")
+            self.metrics.in_flight -= len(batch)
+
+    async def stop(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
+class LanedConsumer:
+    """Processes messages on a fixed pool of lanes keyed by a payload field.
+
+    Messages with the same key (e.g. post_id) always land on the same lane and are
+    handled in delivery order; different lanes run concurrently. The number of
+    unacked messages is bounded by the channel's prefetch count, which in turn
+    bounds the lane queues.
+    """
+
+    def __init__(
+        self,
+        handler,
+        lanes: int,
+        key_field: str = "post_id",
+        batch_handlers: Optional[Dict[str, BatchHandler]] = None,
+        batch_max_messages: int = 1,
+        batch_max_wait_seconds: float = 0.0,
+        decode: Decoder = json.loads,
+    ) -> None:
+        self.handler = handler
+        self.decode = decode
+        self.key_field = key_field
+        self.metrics = ConsumerMetrics()
+        self._queues: List[asyncio.Queue] = [asyncio.Queue() for _ in range(max(lanes, 1))]
+        self._workers: List[asyncio.Task] = []
+        # Routing keys whose events are independent enough to apply in bulk
+        self._batchers: Dict[str, MessageBatcher] = {
+            routing_key: MessageBatcher(
+                batch_handler,
+                handler,
+                self.metrics,
+                batch_max_messages,
+                batch_max_wait_seconds,
+            )
+            for routing_key, batch_handler in (batch_handlers or {}).items()
+        }
+
+    def start(self) -> None:
+        self._workers = [asyncio.create_task(self._work(queue)) for queue in self._queues]
+
+    async def stop(self) -> None:
+        for batcher in self._batchers.values():
+            await batcher.stop()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def _lane_for(self, payload: Dict[str, Any]) -> asyncio.Queue:
+        key = str(payload.get(self.key_field, ""))
+        return self._queues[zlib.crc32(key.encode()) % len(self._queues)]
+
+    async def on_message(self, message: AbstractIncomingMessage) -> None:
+        """aio-pika consumer callback: route the message to its lane."""
+        try:
+            payload = self.decode(message.body)
+        except Exception:  # noqa: BLE001 - each JSON backend raises its own decode error
+            logger.exception("Dropping undecodable post event")
+            await message.reject()
+            return
+        self.metrics.in_flight += 1
+        batcher = self._batchers.get(message.routing_key)
+        if batcher is not None:
+            await batcher.add(message, payload)
+            return
+        await self._lane_for(payload).put((message, payload, time.monotonic()))
+
+    async def _work(self, queue: asyncio.Queue) -> None:
+        while True:
+            message, payload, received_at = await queue.get()
+            self.metrics.last_queue_wait_seconds = time.monotonic() - received_at
+            if message.timestamp:
+                sent_at = message.timestamp
+                if sent_at.tzinfo is None:
+                    sent_at = sent_at.replace(tzinfo=timezone.utc)
+                self.metrics.last_delivery_lag_seconds = (
+                    datetime.now(timezone.utc) - sent_at
+                ).total_seconds()
+            try:
+                async with message.process():
+                    try:
+                        await self.handler(message.routing_key, payload)
+                        self.metrics.record_processed()
+                    except Exception as exc:  # noqa: BLE001
+                        self.metrics.failed += 1
+                        logger.exception("Failed to process post event: %s", exc)
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to acknowledge post event")
+            finally:
+                self.metrics.in_flight -= 1
+                queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.metrics.stats(),
+            "lanes": len(self._queues),
+            "queued": sum(queue.qsize() for queue in self._queues),
+        }
@@ -42,3 +42,24 @@ class CommentDeletedEvent(BaseModel):
     comment_id: UUID
     user_id: UUID
     occurred_at: datetime
+
+
+class StatsInvalidatedEvent(BaseModel):
+    post_id: UUID
+    origin: str
+    # Set for like/unlike so replicas also drop the user's cached like set
+    user_id: UUID | None = None
+    # Set when comments changed so replicas also move the post's comment ETag
+    comments_changed: bool = False
+
+
+class PostStatsChangedEvent(BaseModel):
+    """Coalesced counter change: deltas seen by one instance over a window plus current counts."""
+
+    post_id: UUID
+    likes_count: int
+    comments_count: int
+    likes_delta: int
+    comments_delta: int
+    window_started_at: datetime
+    occurred_at: datetime
@@ -0,0 +1,142 @@
+"""Background relay that drains the transactional outbox into RabbitMQ."""
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+from app.core.config import settings
+from app.db.database import async_session
+from app.messaging.channel_pool import PublishSkipped
+from app.messaging.rabbitmq import RabbitMQManager, rabbitmq_manager
+from app.models.outbox_event import OutboxEvent
+from app.repositories.outbox_repository import OutboxRepository
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxRelay:
+    """Publishes committed outbox rows in id order and deletes them once confirmed.
+
+    Events sharing a partition key (post_id) are pipelined in order on one publisher
+    channel; different posts are published concurrently. When an event fails, the
+    post's events not yet written are not sent and stay in the outbox behind it.
+    Events already in flight behind the failed one are deleted once confirmed, so
+    they are not sent twice, but consumers may see them before the failed event's
+    retry: per-post order holds only while publishes succeed. Delivery is
+    at-least-once: a crash between broker confirm and commit republishes events.
+    An event that fails ``max_attempts`` times is parked and logged, and the rest of
+    its post's events are held behind it until an operator resets or deletes it.
+    """
+
+    def __init__(
+        self,
+        manager: RabbitMQManager = rabbitmq_manager,
+        interval_seconds: float = settings.outbox_relay_interval_seconds,
+        batch_size: int = settings.outbox_batch_size,
+        max_attempts: int = settings.outbox_max_attempts,
+    ) -> None:
+        self.manager = manager
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.published = 0
+        self.failed = 0
+        self.exhausted = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _publish_partition(self, events: Sequence[OutboxEvent]) -> tuple[List[int], List[int], str]:
+        """Pipeline one post's events in order; returns (confirmed ids, failed ids, first error)."""
+        errors = await self.manager.publish_many(
+            [(event.payload, event.routing_key) for event in events],
+            ordering_key=str(events[0].partition_key),
+        )
+        sent: List[int] = []
+        failed: List[int] = []
+        first_error = ""
+        for event, error in zip(events, errors):
+            if error is None:
+                sent.append(event.id)
+            elif not isinstance(error, PublishSkipped):
+                failed.append(event.id)
+                first_error = first_error or repr(error)
+        return sent, failed, first_error
+
+    async def run_once(self) -> int:
+        """Relay one batch and return the number of events published."""
+        if not await self.manager.health_check():
+            return 0
+        async with async_session() as session:
+            repo = OutboxRepository(session)
+            try:
+                if not await repo.try_lock_relay():
+                    await session.rollback()
+                    return 0
+                events = await repo.fetch_batch(self.batch_size, self.max_attempts)
+                if not events:
+                    await session.rollback()
+                    return 0
+
+                partitions: Dict[UUID, List[OutboxEvent]] = defaultdict(list)
+                for event in events:
+                    partitions[event.partition_key].append(event)
+                results = await asyncio.gather(
+                    *(self._publish_partition(batch) for batch in partitions.values())
+                )
+
+                sent_ids = [event_id for sent, _, _ in results for event_id in sent]
+                await repo.delete_many(sent_ids)
+                for _, failed_ids, error in results:
+                    for row in await repo.mark_failed(failed_ids, error):
+                        self.failed += 1
+                        if row.attempts >= self.max_attempts:
+                            self.exhausted += 1
+                            logger.error(
+                                "Outbox event %s (%s) failed %s times and is parked; "
+                                "later events for post %s are held until it is reset or deleted: %s",
+                                row.id, row.routing_key, row.attempts, row.partition_key, error,
+                            )
+                await session.commit()
+                self.published += len(sent_ids)
+                return len(sent_ids)
+            except Exception:  # noqa: BLE001
+                await session.rollback()
+                raise
+
+    async def _run(self) -> None:
+        delay = self.interval_seconds
+        while True:
+            failed_before = self.failed
+            try:
+                while await self.run_once() >= self.batch_size:
+                    pass
+                healthy = self.failed == failed_before
+            except Exception:  # noqa: BLE001
+                logger.exception("Outbox relay iteration failed")
+                healthy = False
+            # Back off while the broker rejects publishes so retries are not burned
+            delay = self.interval_seconds if healthy else min(delay * 2, settings.outbox_max_backoff_seconds)
+            await asyncio.sleep(delay)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "published": self.published,
+            "failed": self.failed,
+            "exhausted": self.exhausted,
+        }
+
+
+outbox_relay = OutboxRelay()
@@ -1,44 +1,186 @@
 """Event publisher for engagement events."""
+import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
 from uuid import UUID
-from app.messaging.rabbitmq import rabbitmq_manager
+from pydantic import BaseModel
+from app.db.database import async_session
+from app.messaging.rabbitmq import RabbitMQManager, rabbitmq_manager
 from app.messaging.events import (
     PostLikedEvent,
     PostUnlikedEvent,
     PostCommentedEvent,
     CommentDeletedEvent,
+    PostStatsChangedEvent,
+    StatsInvalidatedEvent,
 )
+from app.repositories.outbox_repository import OutboxRepository
+from app.repositories.stats_repository import StatsRepository
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class _PendingChange:
+    __slots__ = ("likes_delta", "comments_delta")
+
+    def __init__(self) -> None:
+        self.likes_delta = 0
+        self.comments_delta = 0
+
+
+class StatsChangeCoalescer:
+    """Merges counter changes per post and publishes one ``post.stats_changed`` per window.
+
+    Changes committed on this instance are accumulated in memory; every window the
+    dirty posts' current counts are read in one query and published with the
+    summed deltas. A hot post costs one event per window rather than one per
+    like. Events carry absolute counts, so a lost or failed window is corrected
+    by the next change to that post.
+    """
+
+    def __init__(
+        self,
+        manager: RabbitMQManager = rabbitmq_manager,
+        window_seconds: float = settings.stats_changed_window_ms / 1000,
+        enabled: bool = settings.stats_changed_enabled,
+        max_posts_per_query: int = 1000,
+    ) -> None:
+        self.manager = manager
+        self.window_seconds = window_seconds
+        self.enabled = enabled
+        self.max_posts_per_query = max_posts_per_query
+        self.recorded = 0
+        self.published = 0
+        self.failed = 0
+        self._pending: Dict[UUID, _PendingChange] = {}
+        self._window_started_at = datetime.now(timezone.utc)
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, post_id: UUID, likes_delta: int = 0, comments_delta: int = 0) -> None:
+        if not self.enabled:
+            return
+        change = self._pending.get(post_id)
+        if change is None:
+            change = self._pending[post_id] = _PendingChange()
+        change.likes_delta += likes_delta
+        change.comments_delta += comments_delta
+        self.recorded += 1
+
+    async def flush(self) -> int:
+        """Publish the current window and return the number of events sent."""
+        pending, self._pending = self._pending, {}
+        window_started_at = self._window_started_at
+        self._window_started_at = datetime.now(timezone.utc)
+        if not pending:
+            return 0
+        post_ids = list(pending)
+        sent = 0
+        for start in range(0, len(post_ids), self.max_posts_per_query):
+            chunk = post_ids[start:start + self.max_posts_per_query]
+            async with async_session() as session:
+                rows = {row.post_id: row for row in await StatsRepository(session).get_many(chunk)}
+            occurred_at = datetime.now(timezone.utc)
+            events: List[tuple[Dict[str, Any], str]] = []
+            for post_id in chunk:
+                row = rows.get(post_id)
+                event = PostStatsChangedEvent(
+                    post_id=post_id,
+                    likes_count=row.likes_count if row else 0,
+                    comments_count=row.comments_count if row else 0,
+                    likes_delta=pending[post_id].likes_delta,
+                    comments_delta=pending[post_id].comments_delta,
+                    window_started_at=window_started_at,
+                    occurred_at=occurred_at,
+                )
+                events.append(
+                    (event.model_dump(), f"{settings.content_routing_prefix}.post.stats_changed")
+                )
+            errors = await self.manager.publish_many(events)
+            failed = sum(1 for error in errors if error is not None)
+            self.failed += failed
+            self.published += len(events) - failed
+            sent += len(events) - failed
+        return sent
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.window_seconds)
+            try:
+                await self.flush()
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to publish coalesced stats changes")
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            try:
+                await self.flush()
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to publish final stats changes")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "pending_posts": len(self._pending),
+            "recorded": self.recorded,
+            "published": self.published,
+            "failed": self.failed,
+        }
+
+
+stats_change_coalescer = StatsChangeCoalescer()
+
+
 class EventPublisher:
-    """Publishes engagement events to RabbitMQ."""
+    """Publishes engagement events to RabbitMQ.
+
+    Engagement events are staged in the transactional outbox passed by the caller
+    and delivered by ``OutboxRelay`` after commit; they never touch the broker on
+    the request path.
+    """
 
     def __init__(self) -> None:
         self.manager = rabbitmq_manager
+        self.coalescer = stats_change_coalescer
+        self._background: set[asyncio.Task] = set()
 
     def _routing(self, suffix: str) -> str:
         return f"{settings.content_routing_prefix}.{suffix}"
 
-    async def publish_post_liked(self, post_id: UUID, user_id: UUID, occurred_at: datetime) -> None:
+    def _stage(self, outbox: OutboxRepository, event: BaseModel, suffix: str) -> None:
+        outbox.add(self._routing(suffix), event.model_dump(mode="json"), event.post_id)
+
+    async def publish_post_liked(
+        self, outbox: OutboxRepository, post_id: UUID, user_id: UUID, occurred_at: datetime
+    ) -> None:
         event = PostLikedEvent(post_id=post_id, user_id=user_id, occurred_at=occurred_at)
-        try:
-            await self.manager.publish_event(event.model_dump(), self._routing("post.liked"))
-        except Exception:  # noqa: BLE001
-            logger.exception("Failed to publish PostLiked event")
+        self._stage(outbox, event, "post.liked")
 
-    async def publish_post_unliked(self, post_id: UUID, user_id: UUID, occurred_at: datetime) -> None:
+    async def publish_post_unliked(
+        self, outbox: OutboxRepository, post_id: UUID, user_id: UUID, occurred_at: datetime
+    ) -> None:
         event = PostUnlikedEvent(post_id=post_id, user_id=user_id, occurred_at=occurred_at)
-        try:
-            await self.manager.publish_event(event.model_dump(), self._routing("post.unliked"))
-        except Exception:  # noqa: BLE001
-            logger.exception("Failed to publish PostUnliked event")
+        self._stage(outbox, event, "post.unliked")
 
     async def publish_post_commented(
-        self, post_id: UUID, comment_id: UUID, user_id: UUID, content: str, occurred_at: datetime
+        self,
+        outbox: OutboxRepository,
+        post_id: UUID,
+        comment_id: UUID,
+        user_id: UUID,
+        content: str,
+        occurred_at: datetime,
     ) -> None:
         event = PostCommentedEvent(
             post_id=post_id,
@@ -47,13 +189,15 @@ class EventPublisher:
             content=content,
             occurred_at=occurred_at,
         )
-        try:
-            await self.manager.publish_event(event.model_dump(), self._routing("post.commented"))
-        except Exception:  # noqa: BLE001
-            logger.exception("Failed to publish PostCommented event")
+        self._stage(outbox, event, "post.commented")
 
     async def publish_comment_deleted(
-        self, post_id: UUID, comment_id: UUID, user_id: UUID, occurred_at: datetime
+        self,
+        outbox: OutboxRepository,
+        post_id: UUID,
+        comment_id: UUID,
+        user_id: UUID,
+        occurred_at: datetime,
     ) -> None:
         event = CommentDeletedEvent(
             post_id=post_id,
@@ -61,10 +205,33 @@ class EventPublisher:
             user_id=user_id,
             occurred_at=occurred_at,
         )
+        self._stage(outbox, event, "comment.deleted")
+
+    async def _publish_direct(self, event: BaseModel, suffix: str) -> None:
         try:
-            await self.manager.publish_event(event.model_dump(), self._routing("comment.deleted"))
+            await self.manager.publish_event(event.model_dump(), self._routing(suffix))
         except Exception:  # noqa: BLE001
-            logger.exception("Failed to publish CommentDeleted event")
+            logger.exception("Failed to publish %s event", type(event).__name__)
+
+    def publish_stats_invalidated(
+        self, post_id: UUID, user_id: Optional[UUID] = None, comments_changed: bool = False
+    ) -> None:
+        """Fire-and-forget cache invalidation; losing one only delays expiry to the TTL."""
+        event = StatsInvalidatedEvent(
+            post_id=post_id,
+            origin=settings.instance_id,
+            user_id=user_id,
+            comments_changed=comments_changed,
+        )
+        task = asyncio.create_task(self._publish_direct(event, "stats.invalidated"))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def record_stats_change(
+        self, post_id: UUID, likes_delta: int = 0, comments_delta: int = 0
+    ) -> None:
+        """Feed a committed counter change into the coalesced ``post.stats_changed`` stream."""
+        self.coalescer.record(post_id, likes_delta, comments_delta)
 
 
 event_publisher = EventPublisher()
@@ -1,8 +1,7 @@
 """RabbitMQ connection management and consumers/publishers."""
 import asyncio
-import json
 import logging
-from typing import Awaitable, Callable, Dict, Any, Optional
+from typing import Awaitable, Callable, Dict, Any, List, Optional, Sequence, Tuple
 from aio_pika import Message, ExchangeType, connect_robust
 from aio_pika.exceptions import AMQPConnectionError
 from aio_pika.abc import (
@@ -12,9 +11,15 @@ from aio_pika.abc import (
     AbstractQueue,
 )
 from app.core.config import settings
+from app.core.metrics import timed
+from app.core.serialization import get_decoder, get_encoder
+from app.messaging.channel_pool import PublisherChannelPool
+from app.messaging.consumer import BatchHandler, LanedConsumer
 
 logger = logging.getLogger(__name__)
 EventHandler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+encode_event = get_encoder(settings.event_encoder)
+decode_event = get_decoder(settings.event_encoder)
 
 
 class RabbitMQManager:
@@ -25,11 +30,19 @@ class RabbitMQManager:
         self.channel: Optional[AbstractChannel] = None
         self.post_exchange: Optional[AbstractExchange] = None
         self.content_exchange: Optional[AbstractExchange] = None
-        self._consumer_task: Optional[asyncio.Task] = None
+        self.consumer_channel: Optional[AbstractChannel] = None
+        self.post_consumer: Optional[LanedConsumer] = None
+        self.publisher_pool = PublisherChannelPool(
+            settings.content_exchange,
+            size=settings.publisher_channels,
+            window=settings.publisher_confirm_window,
+        )
+        self._instance_tasks: List[asyncio.Task] = []
 
     async def connect(self) -> None:
         """Establish connection and declare exchanges."""
         self.connection = await connect_robust(settings.rabbitmq_url, loop=asyncio.get_event_loop())
+        # Declarations and the per-instance consumers; publishing uses publisher_pool
         self.channel = await self.connection.channel()
 
         self.post_exchange = await self.channel.declare_exchange(
@@ -42,6 +55,7 @@ class RabbitMQManager:
             ExchangeType.TOPIC,
             durable=True,
         )
+        await self.publisher_pool.open(self.connection)
         logger.info("RabbitMQ connected")
 
     async def connect_with_retry(self, retries: int = 5, delay: float = 5.0) -> None:
@@ -58,55 +72,150 @@ class RabbitMQManager:
         raise RuntimeError("Failed to connect to RabbitMQ after retries")
 
     async def disconnect(self) -> None:
-        """Close consumer and connection."""
-        if self._consumer_task:
-            self._consumer_task.cancel()
+        """Close consumers and connection."""
+        tasks, self._instance_tasks = self._instance_tasks, []
+        for task in tasks:
+            task.cancel()
             try:
-                await self._consumer_task
+                await task
             except asyncio.CancelledError:
                 pass
-            self._consumer_task = None
+
+        if self.consumer_channel and not self.consumer_channel.is_closed:
+            await self.consumer_channel.close()
+        if self.post_consumer:
+            await self.post_consumer.stop()
+            self.post_consumer = None
+        await self.publisher_pool.close()
 
         if self.connection and not self.connection.is_closed:
             await self.connection.close()
             logger.info("RabbitMQ disconnected")
 
-    async def publish_event(self, event_data: Dict[str, Any], routing_key: str) -> None:
-        """Publish event to the content exchange."""
+    @staticmethod
+    def _message(event_data: Dict[str, Any]) -> Message:
+        return Message(
+            encode_event(event_data),
+            content_type="application/json",
+            delivery_mode=2,
+        )
+
+    @timed("messaging", "publish_event")
+    async def publish_event(
+        self, event_data: Dict[str, Any], routing_key: str, ordering_key: Optional[str] = None
+    ) -> None:
+        """Publish event to the content exchange and wait for the broker confirm."""
         if not self.content_exchange:
             raise RuntimeError("RabbitMQ is not connected")
 
-        message_body = json.dumps(event_data, default=str)
-        message = Message(
-            message_body.encode(),
-            content_type="application/json",
-            delivery_mode=2,
+        await self.publisher_pool.publish(self._message(event_data), routing_key, ordering_key)
+
+    @timed("messaging", "publish_many")
+    async def publish_many(
+        self,
+        events: Sequence[Tuple[Dict[str, Any], str]],
+        ordering_key: Optional[str] = None,
+    ) -> List[Optional[BaseException]]:
+        """Publish ``(event_data, routing_key)`` pairs pipelined; return per-event errors.
+
+        Events sharing an ``ordering_key`` are written to one channel in order.
+        """
+        if not self.content_exchange:
+            raise RuntimeError("RabbitMQ is not connected")
+
+        return await self.publisher_pool.publish_many(
+            [(self._message(event_data), routing_key) for event_data, routing_key in events],
+            ordering_key,
         )
-        await self.content_exchange.publish(message, routing_key=routing_key)
 
-    async def start_post_consumer(self, handler: EventHandler) -> None:
-        """Start consumer for post lifecycle events."""
-        if not self.channel or not self.post_exchange:
+    async def start_post_consumer(
+        self,
+        handler: EventHandler,
+        batch_handlers: Optional[Dict[str, BatchHandler]] = None,
+    ) -> None:
+        """Start consumer for post lifecycle events.
+
+        Uses its own channel so the prefetch limit does not affect publishing, and
+        processes up to ``post_consumer_lanes`` posts concurrently while keeping
+        events for the same post_id in order. Routing keys in ``batch_handlers``
+        are micro-batched instead.
+        """
+        if not self.connection or not self.post_exchange:
             raise RuntimeError("RabbitMQ channel not ready")
 
-        queue: AbstractQueue = await self.channel.declare_queue(
+        self.consumer_channel = await self.connection.channel()
+        await self.consumer_channel.set_qos(prefetch_count=settings.post_consumer_prefetch)
+        queue: AbstractQueue = await self.consumer_channel.declare_queue(
             settings.post_queue,
             durable=True,
         )
         await queue.bind(self.post_exchange, routing_key=settings.post_created_routing_key)
         await queue.bind(self.post_exchange, routing_key=settings.post_deleted_routing_key)
 
+        self.post_consumer = LanedConsumer(
+            handler,
+            lanes=settings.post_consumer_lanes,
+            batch_handlers=batch_handlers,
+            batch_max_messages=settings.post_batch_max_messages,
+            batch_max_wait_seconds=settings.post_batch_max_wait_ms / 1000,
+            decode=decode_event,
+        )
+        self.post_consumer.start()
+        await queue.consume(self.post_consumer.on_message)
+
+    async def start_invalidation_consumer(self, handler: EventHandler) -> None:
+        """Start a per-instance consumer for cache invalidation events.
+
+        Each instance binds its own exclusive, auto-deleted queue to the content
+        exchange so that every replica receives every invalidation.
+        """
+        if not self.content_exchange:
+            raise RuntimeError("RabbitMQ channel not ready")
+        await self._start_instance_consumer(
+            handler,
+            [(self.content_exchange, f"{settings.content_routing_prefix}.stats.invalidated")],
+            "invalidation",
+        )
+
+    async def start_trending_consumer(self, handler: EventHandler, routing_keys: Sequence[str]) -> None:
+        """Start a per-instance consumer of engagement events and post deletions.
+
+        Like invalidations, every replica gets its own queue, so each one ranks
+        engagement from all replicas rather than only its own writes.
+        """
+        if not self.content_exchange or not self.post_exchange:
+            raise RuntimeError("RabbitMQ channel not ready")
+        bindings = [(self.content_exchange, routing_key) for routing_key in routing_keys]
+        bindings.append((self.post_exchange, settings.post_deleted_routing_key))
+        await self._start_instance_consumer(handler, bindings, "trending")
+
+    async def _start_instance_consumer(
+        self,
+        handler: EventHandler,
+        bindings: Sequence[Tuple[AbstractExchange, str]],
+        description: str,
+    ) -> None:
+        if not self.channel:
+            raise RuntimeError("RabbitMQ channel not ready")
+
+        queue: AbstractQueue = await self.channel.declare_queue(
+            exclusive=True,
+            auto_delete=True,
+        )
+        for exchange, routing_key in bindings:
+            await queue.bind(exchange, routing_key=routing_key)
+
         async def _consume() -> None:
             async with queue.iterator() as queue_iter:
                 async for message in queue_iter:
                     async with message.process():
                         try:
-                            payload = json.loads(message.body)
+                            payload = decode_event(message.body)
                             await handler(message.routing_key, payload)
                         except Exception as exc:  # noqa: BLE001
-                            logger.exception("Failed to process post event: %s", exc)
+                            logger.exception("Failed to process %s event: %s", description, exc)
 
-        self._consumer_task = asyncio.create_task(_consume())
+        self._instance_tasks.append(asyncio.create_task(_consume()))
 
     async def health_check(self) -> bool:
         """Return connection health status."""
@@ -115,6 +224,7 @@ class RabbitMQManager:
             and not self.connection.is_closed
             and self.channel is not None
             and not self.channel.is_closed
+            and self.publisher_pool.healthy()
         )
 
 
@@ -2,3 +2,7 @@
 from app.models.like import Like  # noqa: F401
 from app.models.comment import Comment  # noqa: F401
 from app.models.post_content_stats import PostContentStats  # noqa: F401
+from app.models.post_like_shard import PostLikeShard  # noqa: F401
+from app.models.outbox_event import OutboxEvent  # noqa: F401
+from app.models.post_purge import PostPurge  # noqa: F401
+from app.models.trending_bucket import TrendingBucket  # noqa: F401
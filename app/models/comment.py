@@ -1,7 +1,7 @@
 """Comment model with soft delete support."""
 import uuid
 from datetime import datetime
-from sqlalchemy import Boolean, Text, func
+from sqlalchemy import Boolean, Index, PrimaryKeyConstraint, Text, func, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
@@ -11,12 +11,26 @@ class Comment(Base):
     """Represents a comment on a post."""
 
     __tablename__ = "comments"
+    __table_args__ = (
+        # Hash-partitioned by post_id, so the primary key has to include it
+        PrimaryKeyConstraint("post_id", "id", name="comments_pkey"),
+        # Deletes arrive with only the comment id; probes each partition's index
+        Index("ix_comments_id", "id"),
+        Index(
+            "ix_comments_post_live_keyset",
+            "post_id",
+            "created_at",
+            "id",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+        {"postgresql_partition_by": "HASH (post_id)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), default=uuid.uuid4
     )
     post_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), nullable=False, index=True
+        UUID(as_uuid=True), nullable=False
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), nullable=False, index=True
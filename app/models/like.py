@@ -1,7 +1,7 @@
 """Like model tracks unique user likes per post."""
 import uuid
 from datetime import datetime
-from sqlalchemy import UniqueConstraint, func
+from sqlalchemy import Index, PrimaryKeyConstraint, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from app.db.base import Base
@@ -12,17 +12,22 @@ class Like(Base):
 
     __tablename__ = "likes"
     __table_args__ = (
+        # Hash-partitioned by post_id, so every key has to include it
+        PrimaryKeyConstraint("post_id", "id", name="likes_pkey"),
         UniqueConstraint("post_id", "user_id", name="uq_like_post_user"),
+        # Covers "which of these posts did the user like" lookups
+        Index("ix_likes_user_post", "user_id", "post_id"),
+        {"postgresql_partition_by": "HASH (post_id)"},
     )
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), default=uuid.uuid4
     )
     post_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), nullable=False, index=True
+        UUID(as_uuid=True), nullable=False
     )
     user_id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), nullable=False, index=True
+        UUID(as_uuid=True), nullable=False
     )
     created_at: Mapped[datetime] = mapped_column(
         default=func.now(), server_default=func.now()
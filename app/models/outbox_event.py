@@ -0,0 +1,24 @@
+"""OutboxEvent model stores events committed alongside engagement writes."""
+import uuid
+from datetime import datetime
+from typing import Any, Optional
+from sqlalchemy import BigInteger, Identity, Integer, String, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class OutboxEvent(Base):
+    """An engagement event awaiting delivery to RabbitMQ."""
+
+    __tablename__ = "outbox_events"
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    routing_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    partition_key: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        default=func.now(), server_default=func.now()
+    )
@@ -1,6 +1,7 @@
 """PostContentStats model tracks engagement counters."""
 import uuid
 from datetime import datetime
+from typing import Optional
 from sqlalchemy import Integer, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
@@ -20,3 +21,5 @@ class PostContentStats(Base):
     updated_at: Mapped[datetime] = mapped_column(
         default=func.now(), server_default=func.now(), onupdate=func.now()
     )
+    # Set when the post is deleted; counters read as zero from then on
+    deleted_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
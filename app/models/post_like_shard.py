@@ -0,0 +1,18 @@
+"""PostLikeShard model holds pending like deltas for sharded counting."""
+import uuid
+from sqlalchemy import Integer, SmallInteger
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class PostLikeShard(Base):
+    """Un-compacted likes delta for one shard of a post's counter."""
+
+    __tablename__ = "post_like_shards"
+
+    post_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True
+    )
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    likes_delta: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
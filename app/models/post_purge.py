@@ -0,0 +1,24 @@
+"""PostPurge model tracks background cleanup of deleted posts."""
+import uuid
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import BigInteger, func
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class PostPurge(Base):
+    """Progress of purging likes and comments for a deleted post."""
+
+    __tablename__ = "post_purges"
+
+    post_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True
+    )
+    likes_purged: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    comments_purged: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        default=func.now(), server_default=func.now()
+    )
+    completed_at: Mapped[Optional[datetime]] = mapped_column(nullable=True)
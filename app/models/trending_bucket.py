@@ -0,0 +1,19 @@
+"""TrendingBucket model checkpoints in-memory trending counts."""
+import uuid
+from datetime import datetime
+from sqlalchemy import DateTime, Float
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+from app.db.base import Base
+
+
+class TrendingBucket(Base):
+    """Engagement score of one post within one time bucket."""
+
+    __tablename__ = "trending_buckets"
+
+    bucket_start: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True)
+    post_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True
+    )
+    score: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
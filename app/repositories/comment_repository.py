@@ -1,11 +1,15 @@
 """Repository for comment persistence operations."""
+from datetime import datetime
 from typing import Optional, Sequence
 from uuid import UUID
-from sqlalchemy import select, update, func
+from sqlalchemy import select, update, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.metrics import instrument
 from app.models.comment import Comment
+from app.repositories.stats_repository import StatsRepository
 
 
+@instrument("repository")
 class CommentRepository:
     """Data access for comments."""
 
@@ -19,35 +23,56 @@ class CommentRepository:
         return comment
 
     async def get_comment(self, comment_id: UUID) -> Optional[Comment]:
+        """Look up a comment by id alone; without post_id this probes ``ix_comments_id`` in every partition."""
         stmt = select(Comment).where(Comment.id == comment_id)
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
     async def list_comments(
-        self, post_id: UUID, page: int, page_size: int
-    ) -> tuple[Sequence[Comment], int]:
-        offset = (page - 1) * page_size
-        base_query = select(Comment).where(Comment.post_id == post_id, Comment.is_deleted.is_(False))
-        items_result = await self.session.execute(
-            base_query.order_by(Comment.created_at.asc()).offset(offset).limit(page_size)
-        )
-        count_result = await self.session.execute(
-            select(func.count()).where(
-                Comment.post_id == post_id,
-                Comment.is_deleted.is_(False),
-            )
+        self,
+        post_id: UUID,
+        limit: int,
+        offset: int = 0,
+        after: Optional[tuple[datetime, UUID]] = None,
+    ) -> Sequence[Comment]:
+        """List live comments ordered by (created_at, id).
+
+        ``after`` is a keyset position; when given, rows strictly after it are
+        returned and ``offset`` should be 0. The filter matches the partial index
+        ``ix_comments_post_live_keyset``. A tombstoned post lists nothing, even
+        before the purger has soft-deleted its comments.
+        """
+        stmt = select(Comment).where(
+            Comment.post_id == post_id, ~Comment.is_deleted, ~StatsRepository.tombstoned(post_id)
         )
-        total = count_result.scalar_one()
-        return items_result.scalars().all(), total
+        if after is not None:
+            stmt = stmt.where(tuple_(Comment.created_at, Comment.id) > tuple_(*after))
+        stmt = stmt.order_by(Comment.created_at.asc(), Comment.id.asc()).offset(offset).limit(limit)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
 
     async def soft_delete(self, comment: Comment) -> None:
         stmt = (
             update(Comment)
-            .where(Comment.id == comment.id)
+            .where(Comment.post_id == comment.post_id, Comment.id == comment.id)
             .values(is_deleted=True)
         )
         await self.session.execute(stmt)
 
-    async def soft_delete_by_post(self, post_id: UUID) -> None:
-        stmt = update(Comment).where(Comment.post_id == post_id).values(is_deleted=True)
-        await self.session.execute(stmt)
+    async def soft_delete_chunk_by_post(self, post_id: UUID, limit: int) -> int:
+        """Soft delete up to ``limit`` live comments of a post; returns how many changed."""
+        chunk = (
+            select(Comment.id)
+            .where(Comment.post_id == post_id, ~Comment.is_deleted)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(Comment)
+            # post_id keeps the update on the post's partition
+            .where(Comment.post_id == post_id, Comment.id.in_(chunk))
+            .values(is_deleted=True)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
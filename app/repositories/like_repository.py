@@ -1,11 +1,16 @@
 """Repository for like persistence operations."""
-from typing import Optional
+import uuid
+from typing import Optional, Sequence, Tuple
 from uuid import UUID
-from sqlalchemy import select, delete
+from sqlalchemy import Row, Select, CTE, and_, select, delete, func, true, any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.metrics import instrument
 from app.models.like import Like
+from app.repositories.stats_repository import StatsRepository
 
 
+@instrument("repository")
 class LikeRepository:
     """Data access for likes."""
 
@@ -23,9 +28,154 @@ class LikeRepository:
         await self.session.flush()
         return like
 
+    async def get_liked_post_ids(self, user_id: UUID, post_ids: Sequence[UUID]) -> set[UUID]:
+        """Return the subset of ``post_ids`` liked by the user (index-only on ix_likes_user_post)."""
+        ids = literal(list(post_ids), ARRAY(PG_UUID(as_uuid=True)))
+        stmt = select(Like.post_id).where(Like.user_id == user_id, Like.post_id == any_(ids))
+        result = await self.session.execute(stmt)
+        return set(result.scalars().all())
+
+    async def get_user_post_ids(self, user_id: UUID, limit: int) -> Sequence[UUID]:
+        """Return up to ``limit`` post IDs liked by the user (index-only on ix_likes_user_post)."""
+        stmt = select(Like.post_id).where(Like.user_id == user_id).limit(limit)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def insert_like(
+        self, post_id: UUID, user_id: UUID, stats_repo: StatsRepository
+    ) -> Optional[Row]:
+        """Insert a like and bump the post counter in one statement.
+
+        Returns (id, post_id, user_id, created_at[, likes_count, comments_count]),
+        or None when the user already liked the post or the post is tombstoned.
+        """
+        uuid_type = PG_UUID(as_uuid=True)
+        inserted = (
+            pg_insert(Like)
+            .from_select(
+                ["id", "post_id", "user_id"],
+                select(
+                    literal(uuid.uuid4(), uuid_type),
+                    literal(post_id, uuid_type),
+                    literal(user_id, uuid_type),
+                ).where(~StatsRepository.tombstoned(post_id)),
+            )
+            .on_conflict_do_nothing(constraint="uq_like_post_user")
+            .returning(Like.id, Like.post_id, Like.user_id, Like.created_at)
+            .cte("inserted_like")
+        )
+        stmt = self._with_counts(
+            inserted,
+            [inserted.c.id, inserted.c.post_id, inserted.c.user_id, inserted.c.created_at],
+            stats_repo,
+            1,
+        )
+        result = await self.session.execute(stmt)
+        return result.one_or_none()
+
+    async def delete_like_returning(
+        self, post_id: UUID, user_id: UUID, stats_repo: StatsRepository
+    ) -> Optional[Row]:
+        """Delete a like and decrement the post counter in one statement.
+
+        Returns (post_id[, likes_count, comments_count]), or None when no like existed.
+        """
+        deleted = (
+            delete(Like)
+            .where(Like.post_id == post_id, Like.user_id == user_id)
+            .returning(Like.post_id)
+            .cte("deleted_like")
+        )
+        stmt = self._with_counts(deleted, [deleted.c.post_id], stats_repo, -1)
+        result = await self.session.execute(stmt)
+        return result.one_or_none()
+
+    async def insert_likes_many(self, pairs: Sequence[Tuple[UUID, UUID]]) -> Sequence[Row]:
+        """Insert (post_id, user_id) likes in one statement, skipping existing ones.
+
+        Returns (id, post_id, user_id, created_at) for the rows actually inserted;
+        likes of tombstoned posts are skipped. Pairs are inserted in sorted order
+        so concurrent batches take index locks in the same order.
+        """
+        pairs = sorted(pairs)
+        uuid_array = ARRAY(PG_UUID(as_uuid=True))
+        requested = (
+            func.unnest(
+                literal([uuid.uuid4() for _ in pairs], uuid_array),
+                literal([post_id for post_id, _ in pairs], uuid_array),
+                literal([user_id for _, user_id in pairs], uuid_array),
+            )
+            .table_valued("id", "post_id", "user_id")
+            .render_derived(name="requested")
+        )
+        stmt = (
+            pg_insert(Like)
+            .from_select(
+                ["id", "post_id", "user_id"],
+                select(requested.c.id, requested.c.post_id, requested.c.user_id).where(
+                    ~StatsRepository.tombstoned(requested.c.post_id)
+                ),
+            )
+            .on_conflict_do_nothing(constraint="uq_like_post_user")
+            .returning(Like.id, Like.post_id, Like.user_id, Like.created_at)
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def delete_likes_many(self, pairs: Sequence[Tuple[UUID, UUID]]) -> Sequence[Row]:
+        """Delete (post_id, user_id) likes in one statement; returns the deleted pairs.
+
+        The rows are first locked ``FOR UPDATE`` in (post_id, user_id) order, so
+        concurrent batches cannot deadlock whatever join the delete is planned with.
+        """
+        uuid_array = ARRAY(PG_UUID(as_uuid=True))
+        requested = (
+            func.unnest(
+                literal([post_id for post_id, _ in pairs], uuid_array),
+                literal([user_id for _, user_id in pairs], uuid_array),
+            )
+            .table_valued("post_id", "user_id")
+            .render_derived(name="requested")
+        )
+        locked = (
+            select(Like.post_id, Like.id)
+            .join(
+                requested,
+                and_(Like.post_id == requested.c.post_id, Like.user_id == requested.c.user_id),
+            )
+            .order_by(Like.post_id, Like.user_id)
+            .with_for_update(of=Like)
+            .cte("locked")
+        )
+        stmt = (
+            delete(Like)
+            .where(Like.post_id == locked.c.post_id, Like.id == locked.c.id)
+            .returning(Like.post_id, Like.user_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    @staticmethod
+    def _with_counts(source: CTE, columns: list, stats_repo: StatsRepository, delta: int) -> Select:
+        ctes, counts = stats_repo.likes_delta_ctes(source, delta)
+        if counts is not None:
+            columns = [*columns, counts.c.likes_count, counts.c.comments_count]
+            stmt = select(*columns).select_from(source).join(counts, true())
+        else:
+            stmt = select(*columns).select_from(source)
+        return stmt.add_cte(*ctes)
+
     async def delete_like(self, like: Like) -> None:
         await self.session.delete(like)
 
-    async def delete_by_post(self, post_id: UUID) -> None:
-        stmt = delete(Like).where(Like.post_id == post_id)
-        await self.session.execute(stmt)
+    async def delete_chunk_by_post(self, post_id: UUID, limit: int) -> int:
+        """Delete up to ``limit`` likes of a post; returns how many were deleted."""
+        chunk = select(Like.id).where(Like.post_id == post_id).limit(limit).scalar_subquery()
+        result = await self.session.execute(
+            # post_id keeps the delete on the post's partition
+            delete(Like)
+            .where(Like.post_id == post_id, Like.id.in_(chunk))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -0,0 +1,68 @@
+"""Repository for transactional outbox operations."""
+from typing import Any, Dict, Sequence
+from uuid import UUID
+from sqlalchemy import Row, exists, select, update, delete, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from app.core.metrics import instrument
+from app.models.outbox_event import OutboxEvent
+
+# Arbitrary application-wide key for the relay's advisory lock
+RELAY_LOCK_KEY = 0x636F6E74656E74  # "content"
+
+
+@instrument("repository")
+class OutboxRepository:
+    """Data access for outbox events."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def add(self, routing_key: str, payload: Dict[str, Any], partition_key: UUID) -> None:
+        """Stage an event in the current transaction."""
+        self.session.add(
+            OutboxEvent(routing_key=routing_key, payload=payload, partition_key=partition_key)
+        )
+
+    async def try_lock_relay(self) -> bool:
+        """Take the transaction-scoped relay lock so only one relay drains at a time."""
+        result = await self.session.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": RELAY_LOCK_KEY}
+        )
+        return bool(result.scalar_one())
+
+    async def fetch_batch(self, limit: int, max_attempts: int) -> Sequence[OutboxEvent]:
+        """Lock the next relayable events, holding back posts whose oldest event is exhausted."""
+        stuck = aliased(OutboxEvent)
+        stmt = (
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.attempts < max_attempts,
+                ~exists().where(
+                    stuck.partition_key == OutboxEvent.partition_key,
+                    stuck.attempts >= max_attempts,
+                    stuck.id < OutboxEvent.id,
+                ),
+            )
+            .order_by(OutboxEvent.id.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def delete_many(self, event_ids: Sequence[int]) -> None:
+        if event_ids:
+            await self.session.execute(delete(OutboxEvent).where(OutboxEvent.id.in_(event_ids)))
+
+    async def mark_failed(self, event_ids: Sequence[int], error: str) -> Sequence[Row]:
+        """Count a failed attempt; returns ``(id, routing_key, partition_key, attempts)`` rows."""
+        if not event_ids:
+            return []
+        result = await self.session.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(event_ids))
+            .values(attempts=OutboxEvent.attempts + 1, last_error=error)
+            .returning(OutboxEvent.id, OutboxEvent.routing_key, OutboxEvent.partition_key, OutboxEvent.attempts)
+        )
+        return result.all()
@@ -0,0 +1,50 @@
+"""Repository for deleted-post purge tracking."""
+from typing import Sequence
+from uuid import UUID
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.metrics import instrument
+from app.models.post_purge import PostPurge
+
+
+@instrument("repository")
+class PurgeRepository:
+    """Data access for post purge jobs."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def enqueue(self, post_id: UUID) -> None:
+        """Schedule (or re-open) a purge for a deleted post."""
+        stmt = pg_insert(PostPurge).values(post_id=post_id)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PostPurge.post_id],
+            set_={"completed_at": None},
+        )
+        await self.session.execute(stmt)
+
+    async def claim_pending(self, limit: int) -> Sequence[PostPurge]:
+        """Lock up to ``limit`` unfinished purges, skipping ones another worker holds."""
+        stmt = (
+            select(PostPurge)
+            .where(PostPurge.completed_at.is_(None))
+            .order_by(PostPurge.created_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def record_progress(
+        self, post_id: UUID, likes: int, comments: int, completed: bool
+    ) -> None:
+        values = {
+            "likes_purged": PostPurge.likes_purged + likes,
+            "comments_purged": PostPurge.comments_purged + comments,
+        }
+        if completed:
+            values["completed_at"] = func.now()
+        await self.session.execute(
+            update(PostPurge).where(PostPurge.post_id == post_id).values(**values)
+        )
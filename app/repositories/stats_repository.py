@@ -1,24 +1,82 @@
 """Repository for post engagement stats operations."""
-from typing import Optional
+import random
+from typing import Dict, Mapping, Optional, Sequence
 from uuid import UUID
-from sqlalchemy import select, update, func
+from sqlalchemy import CTE, Exists, Integer, Row, case, exists, select, update, delete, func, any_, literal, or_, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.metrics import instrument
+from app.core.config import settings
+from app.models.comment import Comment
+from app.models.like import Like
 from app.models.post_content_stats import PostContentStats
+from app.models.post_like_shard import PostLikeShard
 
+# Application-wide advisory lock key serialising counter reconciliation
+RECONCILE_LOCK_KEY = 0x7265636F6E63696C  # "reconcil"
 
+
+@instrument("repository")
 class StatsRepository:
-    """Data access for post engagement counters."""
+    """Data access for post engagement counters.
+
+    When ``like_shards`` is positive, like deltas are written to one of N rows in
+    ``post_like_shards`` instead of the hot ``post_content_stats`` row, reads add
+    the pending deltas on the fly, and ``compact_like_shards`` folds them back.
+    """
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, like_shards: int = settings.like_counter_shards):
         self.session = session
+        self.like_shards = like_shards
+
+    def _likes_count(self):
+        if self.like_shards <= 0:
+            return PostContentStats.likes_count
+        pending = (
+            select(func.coalesce(func.sum(PostLikeShard.likes_delta), 0))
+            .where(PostLikeShard.post_id == PostContentStats.post_id)
+            .scalar_subquery()
+        )
+        return func.greatest(PostContentStats.likes_count + pending, 0)
 
-    async def get(self, post_id: UUID) -> Optional[PostContentStats]:
-        stmt = select(PostContentStats).where(PostContentStats.post_id == post_id)
+    @staticmethod
+    def _live(expr):
+        """Counters of tombstoned posts read as zero."""
+        return case((PostContentStats.deleted_at.is_(None), expr), else_=0)
+
+    @staticmethod
+    def tombstoned(post_id) -> Exists:
+        """``EXISTS`` clause that is true when ``post_id`` (a value or column) is tombstoned."""
+        return exists().where(
+            PostContentStats.post_id == post_id, PostContentStats.deleted_at.is_not(None)
+        )
+
+    def _counts_query(self):
+        return select(
+            PostContentStats.post_id,
+            self._live(self._likes_count()).label("likes_count"),
+            self._live(PostContentStats.comments_count).label("comments_count"),
+        )
+
+    async def get(self, post_id: UUID) -> Optional[Row]:
+        """Fetch (post_id, likes_count, comments_count) for a post."""
+        stmt = self._counts_query().where(PostContentStats.post_id == post_id)
+        result = await self.session.execute(stmt)
+        return result.one_or_none()
+
+    async def is_tombstoned(self, post_id: UUID) -> bool:
+        result = await self.session.execute(select(self.tombstoned(post_id)))
+        return bool(result.scalar())
+
+    async def get_many(self, post_ids: Sequence[UUID]) -> Sequence[Row]:
+        """Fetch counters for several posts in one query; missing posts are omitted."""
+        ids = literal(list(post_ids), ARRAY(PG_UUID(as_uuid=True)))
+        stmt = self._counts_query().where(PostContentStats.post_id == any_(ids))
         result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        return result.all()
 
     async def ensure_stats(self, post_id: UUID) -> PostContentStats:
-        stats = await self.get(post_id)
+        stats = await self.session.get(PostContentStats, post_id)
         if stats:
             return stats
         stats = PostContentStats(post_id=post_id)
@@ -26,26 +84,303 @@ class StatsRepository:
         await self.session.flush()
         return stats
 
-    async def increment_likes(self, post_id: UUID, delta: int) -> None:
+    async def ensure_many(self, post_ids: Sequence[UUID]) -> int:
+        """Create missing stats rows for several posts in one statement; returns rows created."""
+        ids = literal(list(post_ids), ARRAY(PG_UUID(as_uuid=True)))
+        stmt = (
+            pg_insert(PostContentStats)
+            .from_select(["post_id"], select(func.unnest(ids)))
+            .on_conflict_do_nothing(index_elements=[PostContentStats.post_id])
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
+
+    async def increment_likes(self, post_id: UUID, delta: int) -> Optional[Row]:
+        """Apply a likes delta and return the updated (likes_count, comments_count)."""
+        if self.like_shards > 0:
+            return await self._increment_like_shard(post_id, delta)
         stmt = (
             update(PostContentStats)
             .where(PostContentStats.post_id == post_id)
             .values(likes_count=func.greatest(PostContentStats.likes_count + delta, 0))
+            .returning(
+                self._live(PostContentStats.likes_count).label("likes_count"),
+                self._live(PostContentStats.comments_count).label("comments_count"),
+            )
+        )
+        result = await self.session.execute(stmt)
+        return result.one_or_none()
+
+    async def _increment_like_shard(self, post_id: UUID, delta: int) -> Optional[Row]:
+        stmt = pg_insert(PostLikeShard).values(
+            post_id=post_id,
+            shard=random.randrange(self.like_shards),
+            likes_delta=delta,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[PostLikeShard.post_id, PostLikeShard.shard],
+            set_={"likes_delta": PostLikeShard.likes_delta + stmt.excluded.likes_delta},
         )
         await self.session.execute(stmt)
+        return await self.get(post_id)
+
+    def likes_delta_ctes(self, source: CTE, delta: int) -> tuple[list[CTE], Optional[CTE]]:
+        """Build DML CTEs applying ``delta`` to the likes counter of each row in ``source``.
 
-    async def increment_comments(self, post_id: UUID, delta: int) -> None:
+        ``source`` must expose a ``post_id`` column. Returns the CTEs to attach to the
+        enclosing statement and, when the counter is not sharded, the CTE whose
+        ``likes_count``/``comments_count`` columns hold the updated counters.
+        """
+        if self.like_shards <= 0:
+            bump = (
+                pg_insert(PostContentStats)
+                .from_select(
+                    ["post_id", "likes_count"],
+                    select(source.c.post_id, literal(max(delta, 0))),
+                )
+                .on_conflict_do_update(
+                    index_elements=[PostContentStats.post_id],
+                    set_={
+                        "likes_count": func.greatest(PostContentStats.likes_count + delta, 0),
+                        "updated_at": func.now(),
+                    },
+                )
+                .returning(
+                    self._live(PostContentStats.likes_count).label("likes_count"),
+                    self._live(PostContentStats.comments_count).label("comments_count"),
+                )
+                .cte("bump_stats")
+            )
+            return [bump], bump
+
+        # Sharded: make sure the stats row exists for the compactor, then bump one shard
+        ensure = (
+            pg_insert(PostContentStats)
+            .from_select(["post_id"], select(source.c.post_id))
+            .on_conflict_do_nothing(index_elements=[PostContentStats.post_id])
+            .returning(PostContentStats.post_id)
+            .cte("ensure_stats")
+        )
+        shard_insert = pg_insert(PostLikeShard).from_select(
+            ["post_id", "shard", "likes_delta"],
+            select(source.c.post_id, literal(random.randrange(self.like_shards)), literal(delta)),
+        )
+        bump_shard = (
+            shard_insert.on_conflict_do_update(
+                index_elements=[PostLikeShard.post_id, PostLikeShard.shard],
+                set_={"likes_delta": PostLikeShard.likes_delta + shard_insert.excluded.likes_delta},
+            )
+            .returning(PostLikeShard.post_id)
+            .cte("bump_shard")
+        )
+        return [ensure, bump_shard], None
+
+    async def apply_likes_deltas(self, deltas: Mapping[UUID, int]) -> Dict[UUID, Row]:
+        """Apply per-post likes deltas in one statement (after ensuring the rows exist).
+
+        Returns {post_id: (post_id, likes_count, comments_count)} with the updated
+        counters, or an empty dict when the counter is sharded. Rows are locked in
+        post_id order so concurrent batches cannot deadlock.
+        """
+        post_ids = sorted(post_id for post_id, delta in deltas.items() if delta)
+        if not post_ids:
+            return {}
+        await self.ensure_many(post_ids)
+        changes = (
+            func.unnest(
+                literal(post_ids, ARRAY(PG_UUID(as_uuid=True))),
+                literal([deltas[post_id] for post_id in post_ids], ARRAY(Integer)),
+            )
+            .table_valued("post_id", "delta")
+            .render_derived(name="changes")
+        )
+        if self.like_shards > 0:
+            shard_insert = pg_insert(PostLikeShard).from_select(
+                ["post_id", "shard", "likes_delta"],
+                select(
+                    changes.c.post_id,
+                    literal(random.randrange(self.like_shards)),
+                    changes.c.delta,
+                ),
+            )
+            await self.session.execute(
+                shard_insert.on_conflict_do_update(
+                    index_elements=[PostLikeShard.post_id, PostLikeShard.shard],
+                    set_={"likes_delta": PostLikeShard.likes_delta + shard_insert.excluded.likes_delta},
+                )
+            )
+            return {}
+
+        locked = (
+            select(PostContentStats.post_id)
+            .where(PostContentStats.post_id == any_(literal(post_ids, ARRAY(PG_UUID(as_uuid=True)))))
+            .order_by(PostContentStats.post_id)
+            .with_for_update()
+            .cte("locked")
+        )
+        stmt = (
+            update(PostContentStats)
+            .where(
+                PostContentStats.post_id == changes.c.post_id,
+                PostContentStats.post_id == locked.c.post_id,
+            )
+            .values(
+                likes_count=func.greatest(PostContentStats.likes_count + changes.c.delta, 0),
+                updated_at=func.now(),
+            )
+            .returning(
+                PostContentStats.post_id,
+                self._live(PostContentStats.likes_count).label("likes_count"),
+                self._live(PostContentStats.comments_count).label("comments_count"),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return {row.post_id: row for row in result.all()}
+
+    async def increment_comments(self, post_id: UUID, delta: int) -> Optional[Row]:
+        """Apply a comments delta and return the updated (likes_count, comments_count)."""
         stmt = (
             update(PostContentStats)
             .where(PostContentStats.post_id == post_id)
             .values(comments_count=func.greatest(PostContentStats.comments_count + delta, 0))
+            .returning(
+                self._live(self._likes_count()).label("likes_count"),
+                self._live(PostContentStats.comments_count).label("comments_count"),
+            )
         )
-        await self.session.execute(stmt)
+        result = await self.session.execute(stmt)
+        return result.one_or_none()
 
-    async def reset(self, post_id: UUID) -> None:
+    async def live_post_ids_after(self, after: Optional[UUID], limit: int) -> Sequence[UUID]:
+        """Next ``limit`` non-tombstoned post IDs in key order, for chunked scans."""
+        stmt = (
+            select(PostContentStats.post_id)
+            .where(PostContentStats.deleted_at.is_(None))
+            .order_by(PostContentStats.post_id)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(PostContentStats.post_id > after)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def lock_reconcile(self, wait: bool = False) -> bool:
+        """Take the transaction-scoped reconciliation lock.
+
+        ``reconcile`` applies relative corrections, so two transactions computing
+        drift for the same posts at once would both apply it. Holders of this
+        lock run one at a time; a later holder's statement starts after the
+        earlier commit and sees the corrected counts. With ``wait=False`` returns
+        False instead of blocking when another process holds it.
+        """
+        if wait:
+            await self.session.execute(
+                text("SELECT pg_advisory_xact_lock(:key)"), {"key": RECONCILE_LOCK_KEY}
+            )
+            return True
+        result = await self.session.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": RECONCILE_LOCK_KEY}
+        )
+        return bool(result.scalar_one())
+
+    async def reconcile(self, post_ids: Sequence[UUID], dry_run: bool = False) -> Sequence[Row]:
+        """Correct counters that disagree with the likes/comments tables.
+
+        Stored counts and grouped actual counts are read in one statement snapshot
+        and each drifted row is moved by the difference (``count + drift``) rather
+        than overwritten, so writes that commit while the statement runs are not
+        lost. Only drifted rows are updated, and therefore locked. Callers must
+        hold ``lock_reconcile`` so concurrent runs cannot apply a drift twice.
+        Returns (post_id, likes_drift, comments_drift) for every drifted post.
+        """
+        ids = literal(list(post_ids), ARRAY(PG_UUID(as_uuid=True)))
+        stored = (
+            select(
+                PostContentStats.post_id,
+                self._likes_count().label("likes_count"),
+                PostContentStats.comments_count,
+            )
+            .where(PostContentStats.post_id == any_(ids), PostContentStats.deleted_at.is_(None))
+            .cte("stored")
+        )
+        likes = (
+            select(Like.post_id, func.count().label("actual"))
+            .where(Like.post_id == any_(ids))
+            .group_by(Like.post_id)
+            .cte("actual_likes")
+        )
+        comments = (
+            select(Comment.post_id, func.count().label("actual"))
+            .where(Comment.post_id == any_(ids), ~Comment.is_deleted)
+            .group_by(Comment.post_id)
+            .cte("actual_comments")
+        )
+        drift = (
+            select(
+                stored.c.post_id,
+                (func.coalesce(likes.c.actual, 0) - stored.c.likes_count).label("likes_drift"),
+                (func.coalesce(comments.c.actual, 0) - stored.c.comments_count).label("comments_drift"),
+            )
+            .select_from(
+                stored.outerjoin(likes, likes.c.post_id == stored.c.post_id).outerjoin(
+                    comments, comments.c.post_id == stored.c.post_id
+                )
+            )
+            .cte("drift")
+        )
+        drifted = or_(drift.c.likes_drift != 0, drift.c.comments_drift != 0)
+        if dry_run:
+            stmt = select(drift.c.post_id, drift.c.likes_drift, drift.c.comments_drift).where(drifted)
+        else:
+            stmt = (
+                update(PostContentStats)
+                .where(PostContentStats.post_id == drift.c.post_id, drifted)
+                .values(
+                    likes_count=PostContentStats.likes_count + drift.c.likes_drift,
+                    comments_count=PostContentStats.comments_count + drift.c.comments_drift,
+                    updated_at=func.now(),
+                )
+                .returning(PostContentStats.post_id, drift.c.likes_drift, drift.c.comments_drift)
+                .execution_options(synchronize_session=False)
+            )
+        result = await self.session.execute(stmt)
+        return result.all()
+
+    async def tombstone(self, post_id: UUID) -> None:
+        """Mark a post deleted and zero its counters; likes/comments are purged later."""
         stmt = (
             update(PostContentStats)
             .where(PostContentStats.post_id == post_id)
-            .values(likes_count=0, comments_count=0)
+            .values(likes_count=0, comments_count=0, deleted_at=func.now())
         )
         await self.session.execute(stmt)
+        await self.session.execute(delete(PostLikeShard).where(PostLikeShard.post_id == post_id))
+
+    async def compact_like_shards(self, batch_size: int) -> int:
+        """Fold pending shard deltas for up to ``batch_size`` posts into post_content_stats.
+
+        The shard rows are deleted and their sum applied in a single statement, so a
+        concurrent like either lands before the delete (and is folded) or re-creates
+        its shard row afterwards. Returns the number of stats rows updated.
+        """
+        picked = select(PostLikeShard.post_id).distinct().limit(batch_size).cte("picked")
+        folded = (
+            delete(PostLikeShard)
+            .where(PostLikeShard.post_id.in_(select(picked.c.post_id)))
+            .returning(PostLikeShard.post_id, PostLikeShard.likes_delta)
+            .cte("folded")
+        )
+        sums = (
+            select(folded.c.post_id, func.sum(folded.c.likes_delta).label("delta"))
+            .group_by(folded.c.post_id)
+            .cte("sums")
+        )
+        stmt = (
+            update(PostContentStats)
+            .where(PostContentStats.post_id == sums.c.post_id)
+            .values(likes_count=func.greatest(PostContentStats.likes_count + sums.c.delta, 0))
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
@@ -0,0 +1,61 @@
+"""Repository for trending checkpoints."""
+from datetime import datetime
+from typing import Sequence, Tuple
+from uuid import UUID
+from sqlalchemy import DateTime, Float, delete, func, literal, select, any_
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.metrics import instrument
+from app.models.trending_bucket import TrendingBucket
+
+
+@instrument("repository")
+class TrendingRepository:
+    """Data access for checkpointed trending buckets."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def load_since(self, since: datetime) -> Sequence[TrendingBucket]:
+        stmt = select(TrendingBucket).where(TrendingBucket.bucket_start >= since)
+        result = await self.session.execute(stmt)
+        return result.scalars().all()
+
+    async def save_many(self, rows: Sequence[Tuple[datetime, UUID, float]]) -> None:
+        """Upsert ``(bucket_start, post_id, score)`` rows in one statement.
+
+        The written score replaces the stored one, so unlikes and deleted
+        comments lower checkpoints as well as raise them.
+        """
+        if not rows:
+            return
+        values = (
+            func.unnest(
+                literal([row[0] for row in rows], ARRAY(DateTime(timezone=True))),
+                literal([row[1] for row in rows], ARRAY(PG_UUID(as_uuid=True))),
+                literal([row[2] for row in rows], ARRAY(Float)),
+            )
+            .table_valued("bucket_start", "post_id", "score")
+            .render_derived(name="checkpoint")
+        )
+        stmt = pg_insert(TrendingBucket).from_select(
+            ["bucket_start", "post_id", "score"],
+            select(values.c.bucket_start, values.c.post_id, values.c.score),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TrendingBucket.bucket_start, TrendingBucket.post_id],
+            set_={"score": stmt.excluded.score},
+        )
+        await self.session.execute(stmt)
+
+    async def delete_posts(self, post_ids: Sequence[UUID]) -> None:
+        if not post_ids:
+            return
+        ids = literal(list(post_ids), ARRAY(PG_UUID(as_uuid=True)))
+        await self.session.execute(delete(TrendingBucket).where(TrendingBucket.post_id == any_(ids)))
+
+    async def delete_before(self, cutoff: datetime) -> int:
+        result = await self.session.execute(
+            delete(TrendingBucket).where(TrendingBucket.bucket_start < cutoff)
+        )
+        return result.rowcount
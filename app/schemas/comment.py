@@ -1,5 +1,6 @@
 """Pydantic schemas for comment operations."""
 from datetime import datetime
+from typing import Optional
 from uuid import UUID
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -24,11 +25,16 @@ class CommentResponse(BaseModel):
 
 
 class CommentListResponse(BaseModel):
-    """Paginated list of comments."""
+    """Paginated list of comments.
+
+    ``page`` is set for offset pagination and omitted for cursor pagination;
+    ``next_cursor`` continues from the last item in either mode.
+    """
 
     items: list[CommentResponse]
     total: int
-    page: int
+    page: Optional[int] = None
     page_size: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
@@ -1,7 +1,10 @@
 """Pydantic schemas for like operations."""
 from datetime import datetime
 from uuid import UUID
-from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from app.core.config import settings
+from app.schemas.stats import PostStatsResponse
 
 
 class LikeResponse(BaseModel):
@@ -13,3 +16,17 @@ class LikeResponse(BaseModel):
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class LikeLookupRequest(BaseModel):
+    """Incoming payload asking which posts the current user liked."""
+
+    post_ids: list[UUID] = Field(..., min_length=1, max_length=settings.max_stats_batch_size)
+    include_stats: bool = False
+
+
+class LikeLookupResponse(BaseModel):
+    """Liked subset of the requested posts, optionally with their stats."""
+
+    liked_post_ids: list[UUID]
+    stats: Optional[list[PostStatsResponse]] = None
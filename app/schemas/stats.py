@@ -1,6 +1,7 @@
 """Pydantic schema for post engagement stats."""
 from uuid import UUID
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
+from app.core.config import settings
 
 
 class PostStatsResponse(BaseModel):
@@ -11,3 +12,29 @@ class PostStatsResponse(BaseModel):
     comments_count: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class PostStatsBatchRequest(BaseModel):
+    """Incoming payload for batch stats lookups."""
+
+    post_ids: list[UUID] = Field(..., min_length=1, max_length=settings.max_stats_batch_size)
+
+
+class PostStatsBatchResponse(BaseModel):
+    """Engagement counters for a batch of posts, in request order."""
+
+    items: list[PostStatsResponse]
+
+
+class TrendingPost(BaseModel):
+    """A post's engagement score within a trending window."""
+
+    post_id: UUID
+    score: float
+
+
+class TrendingResponse(BaseModel):
+    """Highest-scoring posts in a window, best first."""
+
+    window: str
+    items: list[TrendingPost]
@@ -0,0 +1,218 @@
+"""Bulk import/export of likes and comments with PostgreSQL COPY."""
+import logging
+import time
+from typing import IO, Any, Dict, List, Optional, Sequence, Tuple, Union
+from uuid import UUID, uuid4
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    MetaData,
+    Table,
+    Text,
+    func,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import async_session
+from app.models.comment import Comment
+from app.models.like import Like
+from app.repositories.stats_repository import StatsRepository
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "binary")
+Target = Union[str, IO[bytes]]
+
+
+def _stage_table(kind: str) -> Table:
+    """Unlogged staging table (no WAL) with a per-run name, so concurrent imports never share one."""
+    name = f"bulk_import_{kind}_{uuid4().hex[:12]}"
+    if kind == "likes":
+        columns = [
+            Column("id", PG_UUID(as_uuid=True)),
+            Column("post_id", PG_UUID(as_uuid=True), nullable=False),
+            Column("user_id", PG_UUID(as_uuid=True), nullable=False),
+            Column("created_at", DateTime(timezone=True)),
+        ]
+    else:
+        columns = [
+            Column("id", PG_UUID(as_uuid=True)),
+            Column("post_id", PG_UUID(as_uuid=True), nullable=False),
+            Column("user_id", PG_UUID(as_uuid=True), nullable=False),
+            Column("content", Text, nullable=False),
+            Column("created_at", DateTime(timezone=True)),
+            Column("is_deleted", Boolean),
+        ]
+    return Table(
+        name,
+        MetaData(),
+        Column("seq", BigInteger, autoincrement=True, primary_key=True),
+        *columns,
+        prefixes=["UNLOGGED"],
+    )
+
+
+_targets = {"likes": Like.__table__, "comments": Comment.__table__}
+
+# Column order of exported files and the default order expected on import
+COLUMNS: Dict[str, List[str]] = {
+    "likes": ["id", "post_id", "user_id", "created_at"],
+    "comments": ["id", "post_id", "user_id", "content", "created_at", "is_deleted"],
+}
+
+
+async def _driver_connection(session: AsyncSession):
+    """Return the asyncpg connection behind the session's current transaction."""
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    return raw.driver_connection
+
+
+async def _begin(session: AsyncSession) -> None:
+    # Bulk statements run far longer than the request-path statement timeout
+    await session.execute(text("SET LOCAL statement_timeout = 0"))
+
+
+def _merge_statement(kind: str, stage: Table, low: int, high: int):
+    chunk = (stage.c.seq > low, stage.c.seq <= high)
+    if kind == "likes":
+        rows = select(
+            func.coalesce(stage.c.id, func.gen_random_uuid()),
+            stage.c.post_id,
+            stage.c.user_id,
+            func.coalesce(stage.c.created_at, func.now()),
+        ).where(*chunk)
+        columns = ["id", "post_id", "user_id", "created_at"]
+    else:
+        rows = select(
+            func.coalesce(stage.c.id, func.gen_random_uuid()),
+            stage.c.post_id,
+            stage.c.user_id,
+            stage.c.content,
+            func.coalesce(stage.c.created_at, func.now()),
+            func.coalesce(stage.c.is_deleted, False),
+        ).where(*chunk)
+        columns = ["id", "post_id", "user_id", "content", "created_at", "is_deleted"]
+    # Existing rows win: duplicate (post_id, id) keys and (post_id, user_id) likes are skipped
+    return pg_insert(_targets[kind]).from_select(columns, rows).on_conflict_do_nothing()
+
+
+class BulkTransfer:
+    """Streams likes/comments between files and the database.
+
+    Files are streamed through COPY, so memory stays flat regardless of size.
+    Imports load into a per-run unlogged staging table, merge into the live
+    table in ``chunk_size`` slices (one transaction each), then reconcile
+    ``post_content_stats`` for every post that appeared in the input.
+    """
+
+    def __init__(self, chunk_size: int = 50_000, stats_chunk_size: int = 1_000) -> None:
+        self.chunk_size = chunk_size
+        self.stats_chunk_size = stats_chunk_size
+
+    async def export_table(self, kind: str, output: Target, fmt: str = "csv") -> None:
+        async with async_session() as session:
+            await _begin(session)
+            driver = await _driver_connection(session)
+            await driver.copy_from_table(
+                _targets[kind].name,
+                output=output,
+                columns=COLUMNS[kind],
+                format=fmt,
+                **({"header": True} if fmt == "csv" else {}),
+            )
+            await session.commit()
+
+    async def import_file(
+        self,
+        kind: str,
+        source: Target,
+        fmt: str = "csv",
+        columns: Optional[Sequence[str]] = None,
+        rebuild_stats: bool = True,
+    ) -> Dict[str, Any]:
+        """Load ``source`` into the live table; returns row counts per phase."""
+        stage = _stage_table(kind)
+        started = time.monotonic()
+        summary: Dict[str, Any] = {"kind": kind}
+        try:
+            async with async_session() as session:
+                await _begin(session)
+                connection = await session.connection()
+                await connection.run_sync(lambda sync: stage.create(sync))
+                driver = await _driver_connection(session)
+                await driver.copy_to_table(
+                    stage.name,
+                    source=source,
+                    columns=list(columns or COLUMNS[kind]),
+                    format=fmt,
+                    **({"header": True} if fmt == "csv" else {}),
+                )
+                # Indexed after the load so COPY does not maintain it row by row
+                await session.execute(text(f"CREATE INDEX ON {stage.name} (post_id)"))
+                await session.execute(text(f"ANALYZE {stage.name}"))
+                await session.commit()
+                staged = (await session.execute(select(func.coalesce(func.max(stage.c.seq), 0)))).scalar_one()
+            summary["staged"] = staged
+            logger.info("Staged %s %s rows in %s", staged, kind, stage.name)
+
+            summary["merged"] = await self._merge(kind, stage, staged)
+            if rebuild_stats:
+                summary["stats_checked"], summary["stats_corrected"] = await self._rebuild_stats(stage)
+        finally:
+            async with async_session() as session:
+                connection = await session.connection()
+                await connection.run_sync(lambda sync: stage.drop(sync, checkfirst=True))
+                await session.commit()
+        summary["seconds"] = time.monotonic() - started
+        return summary
+
+    async def _merge(self, kind: str, stage: Table, staged: int) -> int:
+        merged = 0
+        for low in range(0, staged, self.chunk_size):
+            async with async_session() as session:
+                await _begin(session)
+                result = await session.execute(_merge_statement(kind, stage, low, low + self.chunk_size))
+                await session.commit()
+            merged += result.rowcount
+            logger.info(
+                "Merged %s/%s staged %s rows (%s inserted)",
+                min(low + self.chunk_size, staged),
+                staged,
+                kind,
+                merged,
+            )
+        return merged
+
+    async def _rebuild_stats(self, stage: Table) -> Tuple[int, int]:
+        """Reconcile counters of every post in the staging table, in keyset chunks.
+
+        Uses the counter reconciler's drift correction under its advisory lock,
+        so counter updates committed during the import are kept. Returns
+        (posts checked, posts corrected).
+        """
+        checked = corrected = 0
+        last: Optional[UUID] = None
+        while True:
+            async with async_session() as session:
+                await _begin(session)
+                query = (
+                    select(stage.c.post_id).distinct().order_by(stage.c.post_id).limit(self.stats_chunk_size)
+                )
+                if last is not None:
+                    query = query.where(stage.c.post_id > last)
+                post_ids = (await session.execute(query)).scalars().all()
+                if not post_ids:
+                    return checked, corrected
+                repo = StatsRepository(session)
+                await repo.lock_reconcile(wait=True)
+                await repo.ensure_many(post_ids)
+                corrected += len(await repo.reconcile(post_ids))
+                await session.commit()
+            checked += len(post_ids)
+            last = post_ids[-1]
+            logger.info("Reconciled stats for %s posts (%s corrected)", checked, corrected)
@@ -0,0 +1,59 @@
+"""Background compaction of sharded like counters."""
+import asyncio
+import logging
+from typing import Optional
+from app.core.config import settings
+from app.db.database import async_session
+from app.repositories.stats_repository import StatsRepository
+
+logger = logging.getLogger(__name__)
+
+
+class LikeCounterCompactor:
+    """Periodically folds ``post_like_shards`` deltas into ``post_content_stats``."""
+
+    def __init__(
+        self,
+        interval_seconds: float = settings.like_compaction_interval_seconds,
+        batch_size: int = settings.like_compaction_batch_size,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> int:
+        """Compact one batch of posts and return how many were folded."""
+        async with async_session() as session:
+            try:
+                folded = await StatsRepository(session).compact_like_shards(self.batch_size)
+                await session.commit()
+                return folded
+            except Exception:  # noqa: BLE001
+                await session.rollback()
+                raise
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # Keep draining without sleeping while full batches come back
+                while await self.run_once() >= self.batch_size:
+                    pass
+            except Exception:  # noqa: BLE001
+                logger.exception("Like counter compaction failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+like_counter_compactor = LikeCounterCompactor()
@@ -0,0 +1,139 @@
+"""Background reconciliation of post counters against the likes/comments tables."""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+from uuid import UUID
+from app.core.config import settings
+from app.db.database import async_session
+from app.repositories.stats_repository import StatsRepository
+
+logger = logging.getLogger(__name__)
+
+
+class CounterReconciler:
+    """Walks ``post_content_stats`` in key order and repairs drifted counters.
+
+    Each chunk is one short transaction that only locks rows that actually
+    drifted, with a pause between chunks, so a full pass can run continuously
+    alongside production traffic. Chunks hold a cluster-wide advisory lock, so
+    replicas and the CLI never apply the same drift twice.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = settings.reconcile_chunk_size,
+        chunk_pause_seconds: float = settings.reconcile_chunk_pause_seconds,
+        interval_seconds: float = settings.reconcile_interval_seconds,
+        wait_for_lock: bool = False,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.chunk_pause_seconds = chunk_pause_seconds
+        self.interval_seconds = interval_seconds
+        self.wait_for_lock = wait_for_lock
+        self.passes = 0
+        self.scanned = 0
+        self.drifted = 0
+        self.last_pass: Dict[str, Any] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_chunk(
+        self, after: Optional[UUID], dry_run: bool = False
+    ) -> tuple[Optional[UUID], int, int, bool]:
+        """Reconcile the chunk after ``after``.
+
+        Returns (last post_id or None, scanned, drifted, skipped). Unless
+        ``wait_for_lock`` is set, a chunk is skipped when another replica or
+        ``reconcile.py`` holds the reconciliation lock, since that run is
+        correcting counters already.
+        """
+        async with async_session() as session:
+            repo = StatsRepository(session)
+            try:
+                post_ids = await repo.live_post_ids_after(after, self.chunk_size)
+                if not post_ids:
+                    await session.rollback()
+                    return None, 0, 0, False
+                # Dry runs only read, so they never need the lock
+                if not dry_run and not await repo.lock_reconcile(wait=self.wait_for_lock):
+                    await session.rollback()
+                    return post_ids[-1], 0, 0, True
+                drifted = await repo.reconcile(post_ids, dry_run=dry_run)
+                if dry_run:
+                    await session.rollback()
+                else:
+                    await session.commit()
+            except Exception:  # noqa: BLE001
+                await session.rollback()
+                raise
+        for row in drifted:
+            logger.warning(
+                "Counter drift on post %s: likes %+d, comments %+d%s",
+                row.post_id,
+                row.likes_drift,
+                row.comments_drift,
+                " (dry run)" if dry_run else "",
+            )
+        return post_ids[-1], len(post_ids), len(drifted), False
+
+    async def run_pass(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Scan every live post once and return a summary."""
+        started = time.monotonic()
+        after: Optional[UUID] = None
+        scanned = drifted = skipped = 0
+        while True:
+            after, chunk_scanned, chunk_drifted, chunk_skipped = await self.run_chunk(after, dry_run)
+            scanned += chunk_scanned
+            drifted += chunk_drifted
+            skipped += chunk_skipped
+            if after is None:
+                break
+            # Yield to foreground traffic between chunks
+            await asyncio.sleep(self.chunk_pause_seconds)
+        summary = {
+            "scanned": scanned,
+            "drifted": drifted,
+            "skipped_chunks": skipped,
+            "dry_run": dry_run,
+            "seconds": time.monotonic() - started,
+        }
+        if not dry_run:
+            self.passes += 1
+            self.scanned += scanned
+            self.drifted += drifted
+            self.last_pass = summary
+        return summary
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                summary = await self.run_pass()
+                logger.info("Counter reconciliation pass: %s", summary)
+            except Exception:  # noqa: BLE001
+                logger.exception("Counter reconciliation pass failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "passes": self.passes,
+            "scanned": self.scanned,
+            "drifted": self.drifted,
+            "last_pass": self.last_pass,
+        }
+
+
+counter_reconciler = CounterReconciler()
@@ -1,18 +1,31 @@
 """Business logic for likes, comments, and counters."""
 import logging
 from datetime import datetime, timezone
+from typing import Any, Optional, Sequence
 from uuid import UUID
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.metrics import instrument
+from app.core.cache import TTLCache, stats_cache
+from app.core.comment_cache import CommentVersions, comment_versions
+from app.core.like_cache import LikeMembershipCache, like_membership_cache
+from app.core.pagination import decode_cursor, encode_cursor
+from app.db.database import async_session
 from app.repositories.like_repository import LikeRepository
 from app.repositories.comment_repository import CommentRepository
 from app.repositories.stats_repository import StatsRepository
+from app.repositories.outbox_repository import OutboxRepository
+from app.repositories.purge_repository import PurgeRepository
 from app.messaging.publisher import EventPublisher
+from app.services.like_write_buffer import LikeWriteBuffer, like_write_buffer
 from app.schemas.comment import CommentListResponse
+from app.schemas.like import LikeResponse, LikeLookupResponse
+from app.schemas.stats import PostStatsResponse
 
 logger = logging.getLogger(__name__)
 
 
+@instrument("service")
 class EngagementService:
     """Encapsulates engagement workflows for posts."""
 
@@ -22,13 +35,25 @@ class EngagementService:
         like_repo: LikeRepository,
         comment_repo: CommentRepository,
         stats_repo: StatsRepository,
+        outbox_repo: OutboxRepository,
+        purge_repo: PurgeRepository,
         event_publisher: EventPublisher,
+        cache: TTLCache = stats_cache,
+        like_cache: LikeMembershipCache = like_membership_cache,
+        versions: CommentVersions = comment_versions,
+        like_buffer: LikeWriteBuffer = like_write_buffer,
     ) -> None:
         self.session = session
         self.like_repo = like_repo
         self.comment_repo = comment_repo
         self.stats_repo = stats_repo
+        self.outbox_repo = outbox_repo
+        self.purge_repo = purge_repo
         self.event_publisher = event_publisher
+        self.cache = cache
+        self.like_cache = like_cache
+        self.versions = versions
+        self.like_buffer = like_buffer
 
     @classmethod
     def build(cls, session: AsyncSession, publisher: EventPublisher) -> "EngagementService":
@@ -37,89 +62,173 @@ class EngagementService:
             like_repo=LikeRepository(session),
             comment_repo=CommentRepository(session),
             stats_repo=StatsRepository(session),
+            outbox_repo=OutboxRepository(session),
+            purge_repo=PurgeRepository(session),
             event_publisher=publisher,
         )
 
-    async def like_post(self, post_id: UUID, user_id: UUID):
-        await self.stats_repo.ensure_stats(post_id)
-        existing = await self.like_repo.get_by_post_and_user(post_id, user_id)
-        if existing:
+    async def like_post(self, post_id: UUID, user_id: UUID) -> LikeResponse:
+        if self.like_buffer.enabled:
+            like = await self.like_buffer.like(post_id, user_id)
+        else:
+            like = await self._insert_like(post_id, user_id)
+        if like is None:
+            await self._ensure_not_deleted(post_id)
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail="Post already liked by user",
             )
+        self._update_cached_stats(post_id, like, user_id)
+        self.event_publisher.record_stats_change(post_id, likes_delta=1)
+        self.like_cache.record_like(user_id, post_id)
+        return LikeResponse.model_validate(like)
+
+    async def _insert_like(self, post_id: UUID, user_id: UUID) -> Any:
         try:
-            like = await self.like_repo.create_like(post_id, user_id)
-            await self.stats_repo.increment_likes(post_id, 1)
+            like = await self.like_repo.insert_like(post_id, user_id, self.stats_repo)
+            if like is not None:
+                await self.event_publisher.publish_post_liked(
+                    self.outbox_repo,
+                    post_id=post_id,
+                    user_id=user_id,
+                    occurred_at=like.created_at,
+                )
             await self.session.commit()
-            await self.session.refresh(like)
-            await self.event_publisher.publish_post_liked(
-                post_id=post_id,
-                user_id=user_id,
-                occurred_at=like.created_at,
-            )
-            return like
         except Exception:  # noqa: BLE001
             await self.session.rollback()
             logger.exception("Failed to like post %s", post_id)
             raise
+        return like
 
     async def unlike_post(self, post_id: UUID, user_id: UUID) -> None:
-        await self.stats_repo.ensure_stats(post_id)
-        like = await self.like_repo.get_by_post_and_user(post_id, user_id)
-        if not like:
+        if self.like_buffer.enabled:
+            deleted = await self.like_buffer.unlike(post_id, user_id)
+        else:
+            deleted = await self._delete_like(post_id, user_id)
+        if deleted is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Like not found for user",
             )
+        self._update_cached_stats(post_id, deleted, user_id)
+        self.event_publisher.record_stats_change(post_id, likes_delta=-1)
+        self.like_cache.record_unlike(user_id, post_id)
+
+    async def _delete_like(self, post_id: UUID, user_id: UUID) -> Any:
         try:
-            await self.like_repo.delete_like(like)
-            await self.stats_repo.increment_likes(post_id, -1)
+            deleted = await self.like_repo.delete_like_returning(post_id, user_id, self.stats_repo)
+            if deleted is not None:
+                await self.event_publisher.publish_post_unliked(
+                    self.outbox_repo,
+                    post_id=post_id,
+                    user_id=user_id,
+                    occurred_at=datetime.now(timezone.utc),
+                )
             await self.session.commit()
-            occurred_at = datetime.now(timezone.utc)
-            await self.event_publisher.publish_post_unliked(
-                post_id=post_id,
-                user_id=user_id,
-                occurred_at=occurred_at,
-            )
         except Exception:  # noqa: BLE001
             await self.session.rollback()
             logger.exception("Failed to unlike post %s", post_id)
             raise
+        return deleted
+
+    async def lookup_likes(
+        self, user_id: UUID, post_ids: Sequence[UUID], include_stats: bool = False
+    ) -> LikeLookupResponse:
+        unique_ids = list(dict.fromkeys(post_ids))
+        liked = await self._liked_subset(user_id, unique_ids)
+        return LikeLookupResponse(
+            liked_post_ids=[post_id for post_id in unique_ids if post_id in liked],
+            stats=await self.get_stats_many(unique_ids) if include_stats else None,
+        )
+
+    async def _liked_subset(self, user_id: UUID, post_ids: list[UUID]) -> set[UUID]:
+        liked = self.like_cache.liked_subset(user_id, post_ids)
+        if liked is not None:
+            return liked
+        if self.like_cache.enabled:
+            # Load the user's whole (bounded) like set once so later lookups stay in memory.
+            # Always from the primary: a lagging replica would pin a missing like for the TTL.
+            token = self.like_cache.begin_load()
+            limit = self.like_cache.max_per_user + 1
+            async with async_session() as primary:
+                all_liked = await LikeRepository(primary).get_user_post_ids(user_id, limit)
+            if self.like_cache.store(user_id, all_liked, token) or len(all_liked) < limit:
+                return set(all_liked).intersection(post_ids)
+        return await self.like_repo.get_liked_post_ids(user_id, post_ids)
+
+    async def _ensure_not_deleted(self, post_id: UUID) -> None:
+        """Raise 404 for a tombstoned post whose likes/comments are still being purged."""
+        if await self.stats_repo.is_tombstoned(post_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Post not found",
+            )
 
     async def add_comment(self, post_id: UUID, user_id: UUID, content: str):
-        await self.stats_repo.ensure_stats(post_id)
+        stats = await self.stats_repo.ensure_stats(post_id)
+        if stats.deleted_at is not None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Post not found",
+            )
         try:
             comment = await self.comment_repo.create_comment(post_id, user_id, content)
-            await self.stats_repo.increment_comments(post_id, 1)
-            await self.session.commit()
-            await self.session.refresh(comment)
+            counts = await self.stats_repo.increment_comments(post_id, 1)
+            await self.session.refresh(comment, ["created_at"])
             await self.event_publisher.publish_post_commented(
+                self.outbox_repo,
                 post_id=post_id,
                 comment_id=comment.id,
                 user_id=user_id,
                 content=comment.content,
                 occurred_at=comment.created_at,
             )
+            await self.session.commit()
+            self.versions.bump(post_id)
+            self._update_cached_stats(post_id, counts, comments_changed=True)
+            self.event_publisher.record_stats_change(post_id, comments_delta=1)
             return comment
         except Exception:  # noqa: BLE001
             await self.session.rollback()
             logger.exception("Failed to add comment to post %s", post_id)
             raise
 
-    async def list_comments(self, post_id: UUID, page: int, page_size: int) -> CommentListResponse:
-        comments, total = await self.comment_repo.list_comments(post_id, page, page_size)
-        has_next = (page * page_size) < total
-        has_prev = page > 1
+    async def list_comments(
+        self, post_id: UUID, page: int, page_size: int, cursor: Optional[str] = None
+    ) -> CommentListResponse:
+        after = None
+        if cursor is not None:
+            try:
+                after = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor",
+                )
+        offset = 0 if after is not None else (page - 1) * page_size
+        comments = await self.comment_repo.list_comments(
+            post_id, limit=page_size + 1, offset=offset, after=after
+        )
+        has_next = len(comments) > page_size
+        comments = comments[:page_size]
+        next_cursor = (
+            encode_cursor(comments[-1].created_at, comments[-1].id) if has_next else None
+        )
+        stats = await self.get_stats(post_id)
         return CommentListResponse(
             items=comments,
-            total=total,
-            page=page,
+            total=stats.comments_count,
+            page=None if after is not None else page,
             page_size=page_size,
             has_next=has_next,
-            has_prev=has_prev,
+            has_prev=after is not None or page > 1,
+            next_cursor=next_cursor,
         )
 
+    def comments_version(self, post_id: UUID) -> int:
+        """Current comment version of a post; answered from memory."""
+        return self.versions.current(post_id)
+
     async def delete_comment(self, comment_id: UUID, user_id: UUID) -> None:
         comment = await self.comment_repo.get_comment(comment_id)
         if not comment or comment.is_deleted:
@@ -134,24 +243,78 @@ class EngagementService:
             )
         try:
             await self.comment_repo.soft_delete(comment)
-            await self.stats_repo.increment_comments(comment.post_id, -1)
-            await self.session.commit()
-            occurred_at = datetime.now(timezone.utc)
+            counts = await self.stats_repo.increment_comments(comment.post_id, -1)
             await self.event_publisher.publish_comment_deleted(
+                self.outbox_repo,
                 post_id=comment.post_id,
                 comment_id=comment.id,
                 user_id=user_id,
-                occurred_at=occurred_at,
+                occurred_at=datetime.now(timezone.utc),
             )
+            await self.session.commit()
+            self.versions.bump(comment.post_id)
+            self._update_cached_stats(comment.post_id, counts, comments_changed=True)
+            self.event_publisher.record_stats_change(comment.post_id, comments_delta=-1)
         except Exception:  # noqa: BLE001
             await self.session.rollback()
             logger.exception("Failed to delete comment %s", comment_id)
             raise
 
-    async def get_stats(self, post_id: UUID):
-        stats = await self.stats_repo.ensure_stats(post_id)
-        await self.session.commit()
-        return stats
+    async def get_stats(self, post_id: UUID) -> PostStatsResponse:
+        cached = self.cache.get(post_id)
+        if cached is not None:
+            return cached
+        stats = await self.stats_repo.get(post_id)
+        if not stats:
+            response = PostStatsResponse(post_id=post_id, likes_count=0, comments_count=0)
+        else:
+            response = PostStatsResponse.model_validate(stats)
+        self.cache.put(post_id, response)
+        return response
+
+    async def get_stats_many(self, post_ids: Sequence[UUID]) -> list[PostStatsResponse]:
+        unique_ids = list(dict.fromkeys(post_ids))
+        found: dict[UUID, PostStatsResponse] = {}
+        for post_id in unique_ids:
+            cached = self.cache.get(post_id)
+            if cached is not None:
+                found[post_id] = cached
+        missing = [post_id for post_id in unique_ids if post_id not in found]
+        if missing:
+            rows = {row.post_id: row for row in await self.stats_repo.get_many(missing)}
+            for post_id in missing:
+                if post_id in rows:
+                    response = PostStatsResponse.model_validate(rows[post_id])
+                else:
+                    response = PostStatsResponse(post_id=post_id, likes_count=0, comments_count=0)
+                self.cache.put(post_id, response)
+                found[post_id] = response
+        return [found[post_id] for post_id in unique_ids]
+
+    def _update_cached_stats(
+        self,
+        post_id: UUID,
+        counts: Any,
+        user_id: Optional[UUID] = None,
+        comments_changed: bool = False,
+    ) -> None:
+        """Refresh the local cache after a committed write and notify other replicas.
+
+        ``counts`` is any object exposing ``likes_count``/``comments_count``; when the
+        new counters are unknown (e.g. sharded likes) the entry is dropped instead.
+        """
+        if getattr(counts, "likes_count", None) is None:
+            self.cache.invalidate(post_id)
+        else:
+            self.cache.put(
+                post_id,
+                PostStatsResponse(
+                    post_id=post_id,
+                    likes_count=counts.likes_count,
+                    comments_count=counts.comments_count,
+                ),
+            )
+        self.event_publisher.publish_stats_invalidated(post_id, user_id, comments_changed)
 
     async def handle_post_created(self, post_id: UUID) -> None:
         try:
@@ -162,13 +325,30 @@ class EngagementService:
             logger.exception("Failed to initialize stats for post %s", post_id)
             raise
 
+    async def handle_posts_created(self, post_ids: Sequence[UUID]) -> None:
+        try:
+            await self.stats_repo.ensure_many(post_ids)
+            await self.session.commit()
+        except Exception:  # noqa: BLE001
+            await self.session.rollback()
+            logger.exception("Failed to initialize stats for %s posts", len(post_ids))
+            raise
+
     async def handle_post_deleted(self, post_id: UUID) -> None:
         try:
+            # Tombstone now so reads return zeros; PostPurger removes the rows in chunks
             await self.stats_repo.ensure_stats(post_id)
-            await self.comment_repo.soft_delete_by_post(post_id)
-            await self.like_repo.delete_by_post(post_id)
-            await self.stats_repo.reset(post_id)
+            await self.stats_repo.tombstone(post_id)
+            await self.purge_repo.enqueue(post_id)
             await self.session.commit()
+            self.versions.bump(post_id)
+            self._update_cached_stats(
+                post_id,
+                PostStatsResponse(post_id=post_id, likes_count=0, comments_count=0),
+                comments_changed=True,
+            )
+            self.event_publisher.record_stats_change(post_id)
+            self.like_cache.forget_post(post_id)
         except Exception:  # noqa: BLE001
             await self.session.rollback()
             logger.exception("Failed to handle post deletion for %s", post_id)
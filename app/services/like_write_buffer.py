@@ -0,0 +1,236 @@
+"""Group commit for like/unlike requests."""
+import asyncio
+import logging
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from app.core.config import settings
+from app.db.database import async_session
+from app.messaging.publisher import EventPublisher, event_publisher
+from app.repositories.like_repository import LikeRepository
+from app.repositories.outbox_repository import OutboxRepository
+from app.repositories.stats_repository import StatsRepository
+
+logger = logging.getLogger(__name__)
+
+_LIKE = "like"
+_UNLIKE = "unlike"
+
+
+class LikeWriteResult:
+    """Outcome of a buffered like/unlike, shaped like the rows of the unbuffered path."""
+
+    __slots__ = ("id", "post_id", "user_id", "created_at", "likes_count", "comments_count")
+
+    def __init__(
+        self,
+        post_id: UUID,
+        user_id: UUID,
+        counts: Any = None,
+        id: Optional[UUID] = None,
+        created_at: Optional[datetime] = None,
+    ) -> None:
+        self.id = id
+        self.post_id = post_id
+        self.user_id = user_id
+        self.created_at = created_at
+        self.likes_count = getattr(counts, "likes_count", None)
+        self.comments_count = getattr(counts, "comments_count", None)
+
+
+class _PendingWrite:
+    __slots__ = ("kind", "post_id", "user_id", "future")
+
+    def __init__(self, kind: str, post_id: UUID, user_id: UUID, future: asyncio.Future) -> None:
+        self.kind = kind
+        self.post_id = post_id
+        self.user_id = user_id
+        self.future = future
+
+
+class LikeWriteBuffer:
+    """Queues concurrent like/unlike requests and commits them together.
+
+    A flush runs one transaction: a multi-row ``INSERT ... ON CONFLICT DO NOTHING``
+    for likes, one ``DELETE ... USING`` for unlikes, one counter update for the
+    net delta per post, and the outbox rows. Each caller is then resolved with
+    its own outcome (None meaning 409/404). Only one flush runs at a time, so
+    requests arriving during a flush form the next group. A (post, user) pair
+    appears at most once per flush; a repeat waits for the following flush so
+    like-then-unlike keeps its order.
+    """
+
+    def __init__(
+        self,
+        publisher: EventPublisher = event_publisher,
+        max_batch: int = settings.like_group_commit_max_batch,
+        max_wait_seconds: float = settings.like_group_commit_max_wait_ms / 1000,
+        enabled: bool = settings.like_group_commit_enabled,
+    ) -> None:
+        self.publisher = publisher
+        self.max_batch = max(max_batch, 1)
+        self.max_wait_seconds = max_wait_seconds
+        self.enabled = enabled
+        self.flushes = 0
+        self.writes = 0
+        self.failed_flushes = 0
+        self._pending: List[_PendingWrite] = []
+        self._has_pending = asyncio.Event()
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._flushing: Optional[asyncio.Future] = None
+
+    async def like(self, post_id: UUID, user_id: UUID) -> Optional[LikeWriteResult]:
+        """Like a post; returns None when the user already liked it."""
+        return await self._submit(_LIKE, post_id, user_id)
+
+    async def unlike(self, post_id: UUID, user_id: UUID) -> Optional[LikeWriteResult]:
+        """Remove a like; returns None when there was none."""
+        return await self._submit(_UNLIKE, post_id, user_id)
+
+    async def _submit(self, kind: str, post_id: UUID, user_id: UUID) -> Optional[LikeWriteResult]:
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingWrite(kind, post_id, user_id, future))
+        self._has_pending.set()
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return await future
+
+    def _take_batch(self) -> List[_PendingWrite]:
+        batch: List[_PendingWrite] = []
+        deferred: List[_PendingWrite] = []
+        keys = set()
+        for write in self._pending:
+            if write.future.done():  # caller went away before the flush
+                continue
+            key = (write.post_id, write.user_id)
+            if key in keys or len(batch) >= self.max_batch:
+                deferred.append(write)
+                continue
+            keys.add(key)
+            batch.append(write)
+        self._pending = deferred
+        if not deferred:
+            self._has_pending.clear()
+        if len(deferred) < self.max_batch:
+            self._full.clear()
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            await self._has_pending.wait()
+            if not self._full.is_set():
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.max_wait_seconds)
+                except asyncio.TimeoutError:
+                    pass
+            batch = self._take_batch()
+            if batch:
+                # Shielded so stop() cannot abandon a transaction with callers waiting on it
+                self._flushing = asyncio.ensure_future(self._flush_safely(batch))
+                await asyncio.shield(self._flushing)
+
+    async def _flush_safely(self, batch: List[_PendingWrite]) -> None:
+        """Run ``_flush``; if it fails outside its own handling, fail the callers still waiting."""
+        try:
+            await self._flush(batch)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Group commit of %s like writes failed", len(batch))
+            if self._fail(batch, exc):
+                self.failed_flushes += 1
+
+    @staticmethod
+    def _fail(batch: List[_PendingWrite], exc: BaseException) -> int:
+        failed = 0
+        for write in batch:
+            if not write.future.done():
+                write.future.set_exception(exc)
+                failed += 1
+        return failed
+
+    async def _flush(self, batch: List[_PendingWrite]) -> None:
+        likes = [(write.post_id, write.user_id) for write in batch if write.kind == _LIKE]
+        unlikes = [(write.post_id, write.user_id) for write in batch if write.kind == _UNLIKE]
+        async with async_session() as session:
+            outbox = OutboxRepository(session)
+            try:
+                like_repo = LikeRepository(session)
+                inserted = {
+                    (row.post_id, row.user_id): row
+                    for row in (await like_repo.insert_likes_many(likes) if likes else [])
+                }
+                deleted = {
+                    (row.post_id, row.user_id)
+                    for row in (await like_repo.delete_likes_many(unlikes) if unlikes else [])
+                }
+                deltas: Counter = Counter()
+                for post_id, _ in inserted:
+                    deltas[post_id] += 1
+                for post_id, _ in deleted:
+                    deltas[post_id] -= 1
+                counts = await StatsRepository(session).apply_likes_deltas(deltas)
+
+                for row in inserted.values():
+                    await self.publisher.publish_post_liked(
+                        outbox, post_id=row.post_id, user_id=row.user_id, occurred_at=row.created_at
+                    )
+                unliked_at = datetime.now(timezone.utc)
+                for post_id, user_id in deleted:
+                    await self.publisher.publish_post_unliked(
+                        outbox, post_id=post_id, user_id=user_id, occurred_at=unliked_at
+                    )
+                await session.commit()
+            except Exception as exc:  # noqa: BLE001
+                await session.rollback()
+                self.failed_flushes += 1
+                logger.exception("Group commit of %s like writes failed", len(batch))
+                self._fail(batch, exc)
+                return
+
+        self.flushes += 1
+        self.writes += len(batch)
+        for write in batch:
+            if write.future.done():
+                continue
+            key: Tuple[UUID, UUID] = (write.post_id, write.user_id)
+            counts_row = counts.get(write.post_id)
+            if write.kind == _LIKE:
+                row = inserted.get(key)
+                result = None if row is None else LikeWriteResult(
+                    row.post_id, row.user_id, counts_row, id=row.id, created_at=row.created_at
+                )
+            else:
+                result = LikeWriteResult(write.post_id, write.user_id, counts_row) if key in deleted else None
+            write.future.set_result(result)
+
+    async def stop(self) -> None:
+        """Flush whatever is queued and stop the background task."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._flushing is not None:
+            await self._flushing
+        while self._pending:
+            batch = self._take_batch()
+            if batch:
+                await self._flush_safely(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self._pending),
+            "flushes": self.flushes,
+            "writes": self.writes,
+            "failed_flushes": self.failed_flushes,
+            "avg_batch_size": (self.writes / self.flushes) if self.flushes else 0.0,
+        }
+
+
+like_write_buffer = LikeWriteBuffer()
@@ -0,0 +1,180 @@
+"""Online copy of likes/comments into their hash-partitioned replacements."""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    MetaData,
+    Table,
+    Text,
+    any_,
+    func,
+    literal,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import async_session
+from app.models.comment import Comment
+from app.models.like import Like
+
+logger = logging.getLogger(__name__)
+
+_metadata = MetaData()
+_sources: Dict[str, Table] = {"likes": Like.__table__, "comments": Comment.__table__}
+# Shadow tables created by migration 008; renamed to likes/comments by 009
+_targets: Dict[str, Table] = {
+    kind: table.to_metadata(_metadata, name=f"{kind}_partitioned") for kind, table in _sources.items()
+}
+_progress = Table(
+    "partition_backfill",
+    _metadata,
+    Column("table_name", Text, primary_key=True),
+    Column("last_id", PG_UUID(as_uuid=True)),
+    Column("copied", BigInteger),
+    Column("completed_at", DateTime),
+)
+
+KINDS = tuple(_sources)
+
+
+async def _exists(session: AsyncSession, name: str) -> bool:
+    return (await session.execute(select(func.to_regclass(name)))).scalar() is not None
+
+
+class PartitionBackfill:
+    """Copies existing rows into ``<table>_partitioned`` while the service keeps running.
+
+    Migration 008's triggers mirror every new write, so only rows that existed
+    before it need copying. Rows are walked in ``id`` order, ``chunk_size`` per
+    transaction; each chunk is read ``FOR SHARE`` so a concurrent delete or
+    soft delete waits for the copy and is then mirrored onto the copied row
+    instead of being lost. Progress is stored in ``partition_backfill``, so an
+    interrupted run resumes where it stopped.
+    """
+
+    def __init__(self, chunk_size: int = 5_000, chunk_pause_seconds: float = 0.05) -> None:
+        self.chunk_size = chunk_size
+        self.chunk_pause_seconds = chunk_pause_seconds
+
+    async def copy_chunk(self, kind: str) -> Optional[int]:
+        """Copy the next chunk; returns rows inserted, or None once the table is done."""
+        source, target = _sources[kind], _targets[kind]
+        async with async_session() as session:
+            if not await _exists(session, target.name):
+                raise RuntimeError(f"{target.name} does not exist; apply migration 008 (and not yet 009)")
+            progress = (
+                await session.execute(
+                    select(_progress).where(_progress.c.table_name == kind).with_for_update()
+                )
+            ).one()
+            if progress.completed_at is not None:
+                await session.rollback()
+                return None
+            query = select(source.c.id).order_by(source.c.id).limit(self.chunk_size).with_for_update(read=True)
+            if progress.last_id is not None:
+                query = query.where(source.c.id > progress.last_id)
+            ids: List[UUID] = (await session.execute(query)).scalars().all()
+            inserted = 0
+            if ids:
+                rows = select(*source.columns).where(
+                    source.c.id == any_(literal(ids, ARRAY(PG_UUID(as_uuid=True))))
+                )
+                # Rows a trigger already mirrored are kept as they are
+                result = await session.execute(
+                    pg_insert(target).from_select([column.name for column in source.columns], rows)
+                    .on_conflict_do_nothing()
+                )
+                inserted = result.rowcount
+                values: Dict[str, Any] = {"last_id": ids[-1], "copied": _progress.c.copied + inserted}
+            else:
+                values = {"completed_at": func.now()}
+            await session.execute(update(_progress).where(_progress.c.table_name == kind).values(**values))
+            await session.commit()
+        return inserted if ids else None
+
+    async def backfill(self, kind: str) -> Dict[str, Any]:
+        started = time.monotonic()
+        copied = 0
+        while True:
+            inserted = await self.copy_chunk(kind)
+            if inserted is None:
+                break
+            copied += inserted
+            logger.info("Copied %s %s rows into %s_partitioned", copied, kind, kind)
+            await asyncio.sleep(self.chunk_pause_seconds)
+        return {"table": kind, "copied": copied, "seconds": time.monotonic() - started}
+
+    async def status(self) -> List[Dict[str, Any]]:
+        async with async_session() as session:
+            rows = (await session.execute(select(_progress).order_by(_progress.c.table_name))).all()
+        return [
+            {
+                "table": row.table_name,
+                "copied": row.copied,
+                "last_id": str(row.last_id) if row.last_id else None,
+                "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+            }
+            for row in rows
+        ]
+
+    async def swap_ready(self) -> Dict[str, bool]:
+        """Per table, whether migration 009 may run: already swapped, empty, or backfilled."""
+        ready = {}
+        async with async_session() as session:
+            for kind in KINDS:
+                partitioned = (
+                    await session.execute(
+                        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name))"),
+                        {"name": kind},
+                    )
+                ).scalar()
+                if partitioned or not await _exists(session, kind):
+                    ready[kind] = True
+                    continue
+                completed = await _exists(session, _progress.name) and (
+                    await session.execute(
+                        select(_progress.c.completed_at).where(_progress.c.table_name == kind)
+                    )
+                ).scalar() is not None
+                empty = not (await session.execute(text(f"SELECT EXISTS (SELECT 1 FROM {kind})"))).scalar()
+                ready[kind] = completed or empty
+            await session.rollback()
+        return ready
+
+    async def verify(self, kind: str) -> Dict[str, Any]:
+        """Compare row counts of the live table and its mirror (before or after the swap)."""
+        async with async_session() as session:
+            # Both counts in one snapshot so concurrent writes cannot skew them
+            await session.execute(text("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ"))
+            await session.execute(text("SET LOCAL statement_timeout = 0"))
+            mirror = f"{kind}_partitioned"
+            if not await _exists(session, mirror):
+                mirror = f"{kind}_unpartitioned"
+                if not await _exists(session, mirror):
+                    raise RuntimeError(f"No mirror table for {kind}")
+            live = (await session.execute(text(f"SELECT count(*) FROM {kind}"))).scalar_one()
+            mirrored = (await session.execute(text(f"SELECT count(*) FROM {mirror}"))).scalar_one()
+            await session.rollback()
+        return {"table": kind, "mirror": mirror, "live": live, "mirrored": mirrored, "match": live == mirrored}
+
+    async def drop_old(self) -> List[str]:
+        """Drop the mirror triggers and the ``*_unpartitioned`` tables left by migration 009."""
+        dropped = []
+        async with async_session() as session:
+            for kind in KINDS:
+                if await _exists(session, f"{kind}_partitioned"):
+                    raise RuntimeError(f"{kind} has not been swapped yet; apply migration 009 first")
+                old = f"{kind}_unpartitioned"
+                if await _exists(session, old):
+                    await session.execute(text(f"DROP TRIGGER IF EXISTS {kind}_mirror ON {kind}"))
+                    await session.execute(text(f"DROP TABLE {old}"))
+                    dropped.append(old)
+            await session.commit()
+        return dropped
@@ -0,0 +1,80 @@
+"""Background purge of likes and comments belonging to deleted posts."""
+import asyncio
+import logging
+from typing import Optional
+from app.core.config import settings
+from app.db.database import async_session
+from app.repositories.comment_repository import CommentRepository
+from app.repositories.like_repository import LikeRepository
+from app.repositories.purge_repository import PurgeRepository
+
+logger = logging.getLogger(__name__)
+
+
+class PostPurger:
+    """Drains ``post_purges`` in bounded chunks, one short transaction per chunk.
+
+    Progress is stored on the purge row, so a restart simply resumes with the
+    next chunk of whatever is still pending.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = settings.post_purge_chunk_size,
+        chunk_pause_seconds: float = settings.post_purge_chunk_pause_seconds,
+        interval_seconds: float = settings.post_purge_interval_seconds,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.chunk_pause_seconds = chunk_pause_seconds
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def run_once(self) -> bool:
+        """Purge one chunk of the oldest pending post; returns False when idle."""
+        async with async_session() as session:
+            purges = PurgeRepository(session)
+            try:
+                pending = await purges.claim_pending(1)
+                if not pending:
+                    await session.rollback()
+                    return False
+                post_id = pending[0].post_id
+                comments = await CommentRepository(session).soft_delete_chunk_by_post(
+                    post_id, self.chunk_size
+                )
+                likes = await LikeRepository(session).delete_chunk_by_post(post_id, self.chunk_size)
+                completed = comments < self.chunk_size and likes < self.chunk_size
+                await purges.record_progress(post_id, likes, comments, completed)
+                await session.commit()
+                if completed:
+                    logger.info("Purged engagement data for deleted post %s", post_id)
+                return True
+            except Exception:  # noqa: BLE001
+                await session.rollback()
+                raise
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                while await self.run_once():
+                    # Yield to foreground traffic between chunks
+                    await asyncio.sleep(self.chunk_pause_seconds)
+            except Exception:  # noqa: BLE001
+                logger.exception("Post purge iteration failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+post_purger = PostPurger()
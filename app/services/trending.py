@@ -0,0 +1,303 @@
+"""In-memory trending posts ranked over sliding time windows."""
+import asyncio
+import heapq
+import logging
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+from app.core.config import settings
+from app.db.database import async_session
+from app.messaging.events import (
+    CommentDeletedEvent,
+    PostCommentedEvent,
+    PostLikedEvent,
+    PostUnlikedEvent,
+)
+from app.repositories.trending_repository import TrendingRepository
+
+logger = logging.getLogger(__name__)
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+# Scores below this are float residue from adding and removing the same events
+_EPSILON = 1e-9
+
+
+def parse_window(value: str) -> int:
+    """Return the length in seconds of a window such as ``15m``, ``1h`` or ``1d``."""
+    value = value.strip().lower()
+    if len(value) < 2 or value[-1] not in _UNITS or not value[:-1].isdigit():
+        raise ValueError(f"Invalid trending window {value!r}")
+    return int(value[:-1]) * _UNITS[value[-1]]
+
+
+class _Bucket:
+    __slots__ = ("index", "scores", "dirty")
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.scores: Dict[UUID, float] = {}
+        self.dirty: Set[UUID] = set()
+
+
+class TrendingTracker:
+    """Per-post engagement scores in a ring of fixed-width time buckets.
+
+    Every window (``1h``, ``24h``, ...) keeps a running total per post: an event
+    adds to the totals of each window its bucket falls in, and when the clock
+    moves past a bucket its scores are subtracted from the windows it leaves.
+    The top ``top_size`` posts of a window are kept sorted and rebuilt with a
+    heap at most every ``refresh_seconds`` while the window is changing, so a
+    request only slices a ready list.
+
+    With ``half_life_seconds`` set, newer buckets weigh more (exponential
+    decay). Weights are anchored at a landmark bucket and grow forward in time,
+    so totals never have to be rescaled as time passes except for an occasional
+    rebase that keeps the numbers small.
+    """
+
+    def __init__(
+        self,
+        windows: str = settings.trending_windows,
+        bucket_seconds: int = settings.trending_bucket_seconds,
+        half_life_seconds: float = settings.trending_half_life_seconds,
+        comment_weight: float = settings.trending_comment_weight,
+        top_size: int = settings.trending_max_limit,
+        refresh_seconds: float = settings.trending_refresh_ms / 1000,
+        checkpoint_interval_seconds: float = settings.trending_checkpoint_interval_seconds,
+        enabled: bool = settings.trending_enabled,
+    ) -> None:
+        self.bucket_seconds = max(bucket_seconds, 1)
+        self.windows: Dict[str, int] = {
+            name.strip(): max(1, math.ceil(parse_window(name) / self.bucket_seconds))
+            for name in windows.split(",")
+            if name.strip()
+        }
+        self.half_life_seconds = half_life_seconds
+        self.top_size = top_size
+        self.refresh_seconds = refresh_seconds
+        self.checkpoint_interval_seconds = checkpoint_interval_seconds
+        self.enabled = enabled
+        prefix = settings.content_routing_prefix
+        self.event_weights: Dict[str, Tuple[Any, float]] = {
+            f"{prefix}.post.liked": (PostLikedEvent, 1.0),
+            f"{prefix}.post.unliked": (PostUnlikedEvent, -1.0),
+            f"{prefix}.post.commented": (PostCommentedEvent, comment_weight),
+            f"{prefix}.comment.deleted": (CommentDeletedEvent, -comment_weight),
+        }
+        self.recorded = 0
+        self.dropped = 0
+        self.checkpoints = 0
+        self._span = max(self.windows.values(), default=1)
+        self._ring: List[Optional[_Bucket]] = [None] * self._span
+        self._current: Optional[int] = None
+        self._landmark = 0
+        self._totals: Dict[str, Dict[UUID, float]] = {name: {} for name in self.windows}
+        self._top: Dict[str, List[Tuple[UUID, float]]] = {name: [] for name in self.windows}
+        self._stale: Dict[str, bool] = {name: False for name in self.windows}
+        self._built_at: Dict[str, float] = {name: 0.0 for name in self.windows}
+        self._forgotten: Set[UUID] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def routing_keys(self) -> List[str]:
+        return list(self.event_weights)
+
+    def _index(self, at: datetime) -> int:
+        if at.tzinfo is None:
+            # created_at columns are timestamp without time zone, written in UTC
+            at = at.replace(tzinfo=timezone.utc)
+        return int(at.timestamp() // self.bucket_seconds)
+
+    def _bucket_start(self, index: int) -> datetime:
+        return datetime.fromtimestamp(index * self.bucket_seconds, tz=timezone.utc)
+
+    def _weight(self, index: int) -> float:
+        if self.half_life_seconds <= 0:
+            return 1.0
+        return 2.0 ** ((index - self._landmark) * self.bucket_seconds / self.half_life_seconds)
+
+    def _slot(self, index: int) -> Optional[_Bucket]:
+        bucket = self._ring[index % self._span]
+        return bucket if bucket is not None and bucket.index == index else None
+
+    def _advance(self, index: int) -> None:
+        """Move the clock to bucket ``index``, expiring buckets that leave each window."""
+        if self._current is None:
+            self._current = self._landmark = index
+            return
+        if index <= self._current:
+            return
+        for name, length in self.windows.items():
+            totals = self._totals[name]
+            if index - self._current >= length:
+                totals.clear()
+            else:
+                for old in range(self._current - length + 1, index - length + 1):
+                    bucket = self._slot(old)
+                    if bucket is not None:
+                        self._subtract(totals, bucket.scores, self._weight(old))
+            self._stale[name] = True
+        self._current = index
+        if self.half_life_seconds > 0 and (index - self._landmark) * self.bucket_seconds > 32 * self.half_life_seconds:
+            scale = 1.0 / self._weight(index)
+            for totals in self._totals.values():
+                for post_id in totals:
+                    totals[post_id] *= scale
+            self._landmark = index
+
+    @staticmethod
+    def _subtract(totals: Dict[UUID, float], scores: Dict[UUID, float], weight: float) -> None:
+        for post_id, score in scores.items():
+            remaining = totals.get(post_id, 0.0) - score * weight
+            if abs(remaining) < _EPSILON:
+                totals.pop(post_id, None)
+            else:
+                totals[post_id] = remaining
+
+    def _add(self, post_id: UUID, delta: float, index: int, dirty: bool = True) -> None:
+        self._advance(self._index(datetime.now(timezone.utc)))
+        # Clock skew between replicas: never credit a bucket that has not started yet
+        index = min(index, self._current)
+        if index <= self._current - self._span:
+            self.dropped += 1
+            return
+        bucket = self._slot(index)
+        if bucket is None:
+            bucket = self._ring[index % self._span] = _Bucket(index)
+        bucket.scores[post_id] = bucket.scores.get(post_id, 0.0) + delta
+        if dirty:
+            bucket.dirty.add(post_id)
+        weighted = delta * self._weight(index)
+        for name, length in self.windows.items():
+            if index > self._current - length:
+                totals = self._totals[name]
+                score = totals.get(post_id, 0.0) + weighted
+                if abs(score) < _EPSILON:
+                    totals.pop(post_id, None)
+                else:
+                    totals[post_id] = score
+                self._stale[name] = True
+
+    def record(self, post_id: UUID, delta: float, occurred_at: datetime) -> None:
+        if not self.enabled:
+            return
+        self._forgotten.discard(post_id)
+        self._add(post_id, delta, self._index(occurred_at))
+        self.recorded += 1
+
+    def record_event(self, routing_key: str, payload: Dict[str, Any]) -> None:
+        """Apply a like/unlike/comment event from the content exchange."""
+        model, weight = self.event_weights[routing_key]
+        event = model(**payload)
+        self.record(event.post_id, weight, event.occurred_at)
+
+    def forget(self, post_id: UUID) -> None:
+        """Drop a deleted post from every bucket, window and checkpoint."""
+        if not self.enabled:
+            return
+        for bucket in self._ring:
+            if bucket is not None:
+                bucket.scores.pop(post_id, None)
+                bucket.dirty.discard(post_id)
+        for name, totals in self._totals.items():
+            if totals.pop(post_id, None) is not None:
+                self._stale[name] = True
+        self._forgotten.add(post_id)
+
+    def top(self, window: str, limit: int) -> List[Tuple[UUID, float]]:
+        """Highest-scoring posts in ``window`` as ``(post_id, score)``, best first."""
+        self._advance(self._index(datetime.now(timezone.utc)))
+        now = time.monotonic()
+        if self._stale[window] and now - self._built_at[window] >= self.refresh_seconds:
+            ranked = heapq.nlargest(self.top_size, self._totals[window].items(), key=itemgetter(1))
+            self._top[window] = [(post_id, score) for post_id, score in ranked if score > _EPSILON]
+            self._stale[window] = False
+            self._built_at[window] = now
+        # Report decayed scores as of the current bucket
+        scale = 1.0 / self._weight(self._current) if self._current is not None else 1.0
+        return [(post_id, score * scale) for post_id, score in self._top[window][:limit]]
+
+    def _take_dirty(self) -> List[Tuple[datetime, UUID, float]]:
+        rows = []
+        for bucket in self._ring:
+            if bucket is None or not bucket.dirty:
+                continue
+            start = self._bucket_start(bucket.index)
+            rows.extend((start, post_id, bucket.scores.get(post_id, 0.0)) for post_id in bucket.dirty)
+            bucket.dirty = set()
+        return rows
+
+    def _restore_dirty(self, rows: List[Tuple[datetime, UUID, float]]) -> None:
+        for start, post_id, _ in rows:
+            bucket = self._slot(self._index(start))
+            if bucket is not None:
+                bucket.dirty.add(post_id)
+
+    async def checkpoint(self, max_rows_per_statement: int = 5000) -> int:
+        """Write buckets changed since the last checkpoint; returns rows written."""
+        rows = self._take_dirty()
+        forgotten, self._forgotten = self._forgotten, set()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self._span * self.bucket_seconds)
+        try:
+            async with async_session() as session:
+                repo = TrendingRepository(session)
+                for start in range(0, len(rows), max_rows_per_statement):
+                    await repo.save_many(rows[start:start + max_rows_per_statement])
+                await repo.delete_posts(list(forgotten))
+                await repo.delete_before(cutoff)
+                await session.commit()
+        except Exception:
+            self._restore_dirty(rows)
+            self._forgotten |= forgotten
+            raise
+        self.checkpoints += 1
+        return len(rows)
+
+    async def warm_up(self) -> int:
+        """Load checkpointed buckets still inside the longest window; returns rows loaded."""
+        now = self._index(datetime.now(timezone.utc))
+        async with async_session() as session:
+            rows = await TrendingRepository(session).load_since(self._bucket_start(now - self._span + 1))
+        for row in rows:
+            self._add(row.post_id, row.score, self._index(row.bucket_start), dirty=False)
+        return len(rows)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.checkpoint_interval_seconds)
+            try:
+                await self.checkpoint()
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to checkpoint trending buckets")
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            try:
+                await self.checkpoint()
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to write final trending checkpoint")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "recorded": self.recorded,
+            "dropped": self.dropped,
+            "checkpoints": self.checkpoints,
+            "posts": {name: len(totals) for name, totals in self._totals.items()},
+        }
+
+
+trending_tracker = TrendingTracker()
@@ -0,0 +1,56 @@
+"""In-memory stand-in for RabbitMQ used by the load benchmark."""
+import asyncio
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.messaging.rabbitmq import RabbitMQManager, encode_event
+
+
+class InMemoryBroker(RabbitMQManager):
+    """Accepts publishes without a network round-trip and counts them per routing key.
+
+    Bodies are still encoded the way ``RabbitMQManager.publish_event`` encodes
+    them so serialization cost stays in the measurement. ``confirm_latency_ms``
+    simulates the broker confirm round-trip.
+    """
+
+    def __init__(self, confirm_latency_ms: float = 0.0) -> None:
+        super().__init__()
+        self.confirm_latency_seconds = confirm_latency_ms / 1000
+        self.published: Counter = Counter()
+        self.published_bytes = 0
+
+    async def connect(self) -> None:
+        return None
+
+    async def disconnect(self) -> None:
+        return None
+
+    async def publish_event(
+        self, event_data: Dict[str, Any], routing_key: str, ordering_key: Optional[str] = None
+    ) -> None:
+        body = encode_event(event_data)
+        if self.confirm_latency_seconds:
+            await asyncio.sleep(self.confirm_latency_seconds)
+        self.published[routing_key] += 1
+        self.published_bytes += len(body)
+
+    async def publish_many(
+        self,
+        events: Sequence[Tuple[Dict[str, Any], str]],
+        ordering_key: Optional[str] = None,
+    ) -> List[Optional[BaseException]]:
+        for event_data, routing_key in events:
+            body = encode_event(event_data)
+            self.published[routing_key] += 1
+            self.published_bytes += len(body)
+        # Pipelined: the whole window waits for a single confirm round-trip
+        if self.confirm_latency_seconds and events:
+            await asyncio.sleep(self.confirm_latency_seconds)
+        return [None] * len(events)
+
+    async def health_check(self) -> bool:
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {"published": dict(self.published), "published_bytes": self.published_bytes}
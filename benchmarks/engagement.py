@@ -0,0 +1,269 @@
+"""End-to-end load benchmark for the engagement endpoints.
+
+Drives ``app.api.routers.engagement`` in-process through httpx's ASGI transport
+against the Postgres configured by ``DATABASE_URL`` (migrated to head), with an
+in-memory broker in place of RabbitMQ. Writes a JSON report with throughput and
+latency percentiles per operation so runs can be diffed release over release.
+
+    python -m benchmarks.engagement --duration 30 --concurrency 64 --skew 1.1
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.db.database import engine, pool_stats, read_engine
+from app.main import _handle_post_created_batch, app
+from app.messaging.outbox_relay import OutboxRelay
+from app.messaging.publisher import EventPublisher, get_event_publisher
+from app.services.counter_compactor import like_counter_compactor
+from app.services.post_purger import post_purger
+from benchmarks.broker import InMemoryBroker
+from benchmarks.workload import DEFAULT_MIX, Population, ZipfSampler, parse_mix
+
+# Statuses that are a correct outcome for the request rather than a failure
+EXPECTED_STATUSES = {
+    "like": {201, 409},
+    "unlike": {204, 404},
+    "comment": {201},
+    "list": {200},
+    "stats": {200},
+}
+SEED_BATCH_SIZE = 1000
+
+
+class Recorder:
+    """Collects per-operation latencies and status codes after the warmup."""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.statuses: Dict[str, Counter] = defaultdict(Counter)
+        self.errors: Counter = Counter()
+
+    def record(self, operation: str, seconds: float, status_code: Optional[int]) -> None:
+        if status_code is None or status_code not in EXPECTED_STATUSES[operation]:
+            self.errors[operation] += 1
+        if status_code is not None:
+            self.statuses[operation][status_code] += 1
+        self.latencies[operation].append(seconds)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict[str, Any]:
+    operations = {}
+    for operation, values in sorted(recorder.latencies.items()):
+        values.sort()
+        operations[operation] = {
+            "count": len(values),
+            "errors": recorder.errors[operation],
+            "throughput_per_second": len(values) / elapsed if elapsed else 0.0,
+            "mean_ms": 1000 * sum(values) / len(values),
+            "p50_ms": 1000 * percentile(values, 0.50),
+            "p95_ms": 1000 * percentile(values, 0.95),
+            "p99_ms": 1000 * percentile(values, 0.99),
+            "max_ms": 1000 * values[-1],
+            "statuses": {str(code): count for code, count in sorted(recorder.statuses[operation].items())},
+        }
+    total = sum(op["count"] for op in operations.values())
+    return {
+        "operations": operations,
+        "totals": {
+            "count": total,
+            "errors": sum(recorder.errors.values()),
+            "throughput_per_second": total / elapsed if elapsed else 0.0,
+            "measured_seconds": elapsed,
+        },
+    }
+
+
+async def _request(client: httpx.AsyncClient, operation: str, post_id, token: str) -> httpx.Response:
+    headers = {"Authorization": f"Bearer {token}"}
+    if operation == "like":
+        return await client.post(f"/posts/{post_id}/like", headers=headers)
+    if operation == "unlike":
+        return await client.delete(f"/posts/{post_id}/like", headers=headers)
+    if operation == "comment":
+        return await client.post(
+            f"/posts/{post_id}/comments", headers=headers, json={"content": "benchmark comment"}
+        )
+    if operation == "list":
+        return await client.get(f"/posts/{post_id}/comments", params={"page_size": settings.default_page_size})
+    return await client.get(f"/posts/{post_id}/stats")
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    population: Population,
+    posts: ZipfSampler,
+    mix: Dict[str, float],
+    rng: random.Random,
+    recorder: Recorder,
+    measure_from: float,
+    deadline: float,
+) -> None:
+    operations, weights = list(mix), list(mix.values())
+    while True:
+        started = time.perf_counter()
+        if started >= deadline:
+            return
+        operation = rng.choices(operations, weights)[0]
+        user_id = rng.choice(population.user_ids)
+        status_code: Optional[int] = None
+        try:
+            response = await _request(client, operation, posts.sample(), population.tokens[user_id])
+            status_code = response.status_code
+        except Exception:  # noqa: BLE001 - a failed request is a data point, not a crash
+            pass
+        if started >= measure_from:
+            recorder.record(operation, time.perf_counter() - started, status_code)
+
+
+async def _seed(population: Population) -> None:
+    """Create stats rows through the same batch handler post.created events use."""
+    owner = population.user_ids[0]
+    for start in range(0, len(population.post_ids), SEED_BATCH_SIZE):
+        chunk = population.post_ids[start:start + SEED_BATCH_SIZE]
+        await _handle_post_created_batch(
+            [{"post_id": str(post_id), "user_id": str(owner)} for post_id in chunk]
+        )
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    started_at = datetime.now(timezone.utc)
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    population = Population.generate(args.posts, args.users)
+
+    broker = InMemoryBroker(confirm_latency_ms=args.broker_latency_ms)
+    publisher = EventPublisher()
+    publisher.manager = broker
+    relay = OutboxRelay(manager=broker)
+    app.dependency_overrides[get_event_publisher] = lambda: publisher
+
+    await _seed(population)
+    relay.start()
+    post_purger.start()
+    if settings.like_counter_shards > 0:
+        like_counter_compactor.start()
+
+    recorder = Recorder()
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+            started = time.perf_counter()
+            measure_from = started + args.warmup
+            deadline = measure_from + args.duration
+            await asyncio.gather(
+                *(
+                    _worker(
+                        client,
+                        population,
+                        ZipfSampler(population.post_ids, args.skew, random.Random(rng.random())),
+                        mix,
+                        random.Random(rng.random()),
+                        recorder,
+                        measure_from,
+                        deadline,
+                    )
+                    for _ in range(args.concurrency)
+                )
+            )
+            elapsed = time.perf_counter() - measure_from
+    finally:
+        await like_counter_compactor.stop()
+        await post_purger.stop()
+        await relay.stop()
+        app.dependency_overrides.pop(get_event_publisher, None)
+
+    report = {
+        "meta": {
+            "started_at": started_at.isoformat(),
+            "service_version": settings.service_version,
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+        },
+        "config": {
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "concurrency": args.concurrency,
+            "posts": args.posts,
+            "users": args.users,
+            "skew": args.skew,
+            "mix": mix,
+            "seed": args.seed,
+            "broker_latency_ms": args.broker_latency_ms,
+            "like_counter_shards": settings.like_counter_shards,
+            "db_pool_size": settings.db_pool_size,
+        },
+        **summarize(recorder, elapsed),
+        "broker": broker.stats(),
+        "outbox_relay": relay.stats(),
+        "db_pools": pool_stats(),
+    }
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
+    return report
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="Unmeasured seconds before measuring")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent client loops")
+    parser.add_argument("--posts", type=int, default=10_000, help="Posts to seed")
+    parser.add_argument("--users", type=int, default=5_000, help="Distinct users issuing requests")
+    parser.add_argument(
+        "--skew",
+        type=float,
+        default=1.1,
+        help="Zipf exponent for post popularity; 0 is uniform, ~1.1 concentrates traffic on hot posts",
+    )
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--broker-latency-ms", type=float, default=0.0, help="Simulated publisher-confirm latency"
+    )
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    body = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(body + "\n")
+    else:
+        sys.stdout.write(body + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Micro-benchmarks for the serialization hot paths.
+
+Covers the like response (ORM row -> ``LikeResponse`` -> JSON body) and engagement
+events (``model_dump`` -> broker message body, and back), once per installed JSON
+backend. ``json_default_str`` is the previous ``json.dumps(..., default=str)``
+publish path, kept as the baseline.
+
+    python -m benchmarks.serialization --output serialization.json
+"""
+import argparse
+import json
+import sys
+import timeit
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from app.core.serialization import DECODERS, ENCODERS
+from app.messaging.events import PostLikedEvent
+from app.models.like import Like
+from app.schemas.like import LikeResponse
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Best-of-``repeat`` per-call time, each run sized by ``Timer.autorange``."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=repeat, number=number)) / number
+    return {"ns_per_op": best * 1e9, "ops_per_second": 1 / best if best else 0.0}
+
+
+def cases(encoders: List[str]) -> Dict[str, Callable[[], Any]]:
+    now = datetime.now(timezone.utc)
+    like = Like(id=uuid4(), post_id=uuid4(), user_id=uuid4(), created_at=now)
+    response = LikeResponse.model_validate(like)
+    response_body = response.model_dump(mode="json")
+    event = PostLikedEvent(post_id=like.post_id, user_id=like.user_id, occurred_at=now)
+    event_data = event.model_dump()
+
+    selected: Dict[str, Callable[[], Any]] = {
+        "like_response.model_validate": lambda: LikeResponse.model_validate(like),
+        "like_response.model_dump_json": response.model_dump_json,
+        "event.model_dump": event.model_dump,
+        "event.model_dump_json_mode": lambda: event.model_dump(mode="json"),
+        "event.encode.json_default_str": lambda: json.dumps(event_data, default=str).encode(),
+    }
+    for name in encoders:
+        encode = ENCODERS[name]
+        decode = DECODERS[name]
+        body = encode(event_data)
+        selected[f"like_response.render.{name}"] = lambda encode=encode: encode(response_body)
+        selected[f"like_response.end_to_end.{name}"] = lambda encode=encode: encode(
+            LikeResponse.model_validate(like).model_dump(mode="json")
+        )
+        selected[f"event.encode.{name}"] = lambda encode=encode: encode(event_data)
+        selected[f"event.end_to_end.{name}"] = lambda encode=encode: encode(event.model_dump())
+        selected[f"event.decode.{name}"] = lambda decode=decode, body=body: decode(body)
+    return selected
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    encoders = args.encoders or sorted(ENCODERS)
+    unknown = set(encoders) - set(ENCODERS)
+    if unknown:
+        raise SystemExit(f"Not installed: {', '.join(sorted(unknown))}; available: {', '.join(sorted(ENCODERS))}")
+    results = {name: measure(func, args.repeat) for name, func in cases(encoders).items()}
+    return {"encoders": encoders, "repeat": args.repeat, "results": results}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--encoders", nargs="*", help="JSON backends to compare (default: all installed)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing runs per case; the best is kept")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    body = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(body + "\n")
+    else:
+        sys.stdout.write(body + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Workload generation: operation mix, post popularity skew and user tokens."""
+import bisect
+import itertools
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+from uuid import UUID, uuid4
+
+from jose import jwt
+
+from app.core.config import settings
+
+OPERATIONS = ("like", "unlike", "comment", "list", "stats")
+DEFAULT_MIX = "like=35,unlike=15,comment=10,list=20,stats=20"
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """Parse ``"like=35,stats=20"`` into operation weights."""
+    weights: Dict[str, float] = {}
+    for part in filter(None, (chunk.strip() for chunk in spec.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation {name!r}; expected one of {', '.join(OPERATIONS)}")
+        weights[name] = float(weight)
+    if not weights or sum(weights.values()) <= 0:
+        raise ValueError("Operation mix must contain at least one positive weight")
+    return weights
+
+
+class ZipfSampler:
+    """Picks items with probability proportional to ``1 / rank**exponent``.
+
+    An exponent of 0 is uniform; around 1.0-1.2 a handful of posts receive most
+    of the traffic, which is what a viral post looks like.
+    """
+
+    def __init__(self, items: Sequence, exponent: float, rng: random.Random) -> None:
+        self.items = list(items)
+        self.rng = rng
+        weights = [1.0 / (rank ** exponent) for rank in range(1, len(self.items) + 1)]
+        self._cumulative = list(itertools.accumulate(weights))
+
+    def sample(self):
+        point = self.rng.random() * self._cumulative[-1]
+        return self.items[bisect.bisect_left(self._cumulative, point)]
+
+
+def issue_token(user_id: UUID, lifetime_seconds: int = 3600) -> str:
+    """Sign an access token the service will accept."""
+    claims = {"sub": str(user_id), "exp": int(time.time()) + lifetime_seconds}
+    return jwt.encode(claims, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+
+
+@dataclass
+class Population:
+    post_ids: List[UUID]
+    user_ids: List[UUID]
+    tokens: Dict[UUID, str]
+
+    @classmethod
+    def generate(cls, posts: int, users: int) -> "Population":
+        post_ids = [uuid4() for _ in range(posts)]
+        user_ids = [uuid4() for _ in range(users)]
+        return cls(post_ids, user_ids, {user_id: issue_token(user_id) for user_id in user_ids})
@@ -0,0 +1,61 @@
+"""Bulk import/export of likes and comments for Content Service.
+
+    python bulk.py export likes likes.csv
+    python bulk.py import comments comments.bin --format binary
+    python bulk.py import likes legacy.csv --columns post_id,user_id,created_at
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from app.db.database import engine
+from app.services.bulk_transfer import COLUMNS, FORMATS, BulkTransfer
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Stream likes/comments in and out with COPY")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Write a table to a file ('-' for stdout)")
+    export.add_argument("kind", choices=sorted(COLUMNS))
+    export.add_argument("path")
+    export.add_argument("--format", choices=FORMATS, default="csv")
+
+    load = commands.add_parser("import", help="Merge a file ('-' for stdin) into a table")
+    load.add_argument("kind", choices=sorted(COLUMNS))
+    load.add_argument("path")
+    load.add_argument("--format", choices=FORMATS, default="csv")
+    load.add_argument(
+        "--columns",
+        help="Comma-separated column order of the input (default: the export order); "
+        "missing id/created_at/is_deleted are generated",
+    )
+    load.add_argument("--chunk-size", type=int, default=50_000, help="Rows merged per transaction")
+    load.add_argument("--skip-stats", action="store_true", help="Do not reconcile post_content_stats")
+    return parser.parse_args()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    transfer = BulkTransfer(chunk_size=getattr(args, "chunk_size", 50_000))
+    try:
+        if args.command == "export":
+            target = sys.stdout.buffer if args.path == "-" else args.path
+            await transfer.export_table(args.kind, target, args.format)
+        else:
+            source = sys.stdin.buffer if args.path == "-" else args.path
+            summary = await transfer.import_file(
+                args.kind,
+                source,
+                args.format,
+                columns=args.columns.split(",") if args.columns else None,
+                rebuild_stats=not args.skip_stats,
+            )
+            print(json.dumps(summary), file=sys.stderr)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s", stream=sys.stderr)
+    asyncio.run(_main(_parse_args()))
@@ -5,8 +5,15 @@ set -e
 # Ensure the /app directory (where the FastAPI project lives) is on PYTHONPATH
 export PYTHONPATH=/app
 
-# Run database migrations
-alembic upgrade head
+# Run database migrations. 009 swaps in the partitioned likes/comments tables and
+# refuses to run on existing data before `python partition.py backfill` finishes,
+# so stop at 008 until then (a fresh or already swapped database goes to head).
+alembic upgrade 008_partition_engagement
+if python partition.py swap-ready; then
+    alembic upgrade head
+else
+    echo "likes/comments not backfilled yet; staying on 008_partition_engagement" >&2
+fi
 
 # Start the application
 exec "$@"
\ No newline at end of file
@@ -0,0 +1,34 @@
+"""sharded like counters
+
+Revision ID: 002_like_shards
+Revises: 001_initial
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "002_like_shards"
+down_revision: Union[str, None] = "001_initial"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create pending like delta shards."""
+    op.create_table(
+        "post_like_shards",
+        sa.Column("post_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("shard", sa.SmallInteger(), nullable=False),
+        sa.Column("likes_delta", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("post_id", "shard"),
+    )
+
+
+def downgrade() -> None:
+    """Drop pending like delta shards."""
+    op.drop_table("post_like_shards")
@@ -0,0 +1,39 @@
+"""keyset index for comment listing
+
+Revision ID: 003_comments_keyset_index
+Revises: 002_like_shards
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "003_comments_keyset_index"
+down_revision: Union[str, None] = "002_like_shards"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create partial (post_id, created_at, id) index over live comments."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_comments_post_live_keyset",
+            "comments",
+            ["post_id", "created_at", "id"],
+            postgresql_where=sa.text("NOT is_deleted"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Drop the keyset index."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_comments_post_live_keyset",
+            table_name="comments",
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,44 @@
+"""post tombstones and purge tracking
+
+Revision ID: 005_post_tombstones
+Revises: 004_outbox_events
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "005_post_tombstones"
+down_revision: Union[str, None] = "004_outbox_events"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add stats tombstone column and purge progress table."""
+    op.add_column("post_content_stats", sa.Column("deleted_at", sa.DateTime(), nullable=True))
+    op.create_table(
+        "post_purges",
+        sa.Column("post_id", postgresql.UUID(as_uuid=True), primary_key=True),
+        sa.Column("likes_purged", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("comments_purged", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_post_purges_pending",
+        "post_purges",
+        ["created_at"],
+        postgresql_where=sa.text("completed_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Drop purge progress table and tombstone column."""
+    op.drop_index("ix_post_purges_pending", table_name="post_purges")
+    op.drop_table("post_purges")
+    op.drop_column("post_content_stats", "deleted_at")
@@ -0,0 +1,35 @@
+"""covering index for per-user like lookups
+
+Revision ID: 006_likes_user_post_index
+Revises: 005_post_tombstones
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "006_likes_user_post_index"
+down_revision: Union[str, None] = "005_post_tombstones"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Replace ix_likes_user_id with a (user_id, post_id) index."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_likes_user_post",
+            "likes",
+            ["user_id", "post_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_likes_user_id", table_name="likes", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Restore the single-column user index."""
+    with op.get_context().autocommit_block():
+        op.create_index("ix_likes_user_id", "likes", ["user_id"], postgresql_concurrently=True)
+        op.drop_index("ix_likes_user_post", table_name="likes", postgresql_concurrently=True)
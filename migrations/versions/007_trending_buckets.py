@@ -0,0 +1,36 @@
+"""trending bucket checkpoints
+
+Revision ID: 007_trending_buckets
+Revises: 006_likes_user_post_index
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "007_trending_buckets"
+down_revision: Union[str, None] = "006_likes_user_post_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create per-bucket trending score checkpoints."""
+    op.create_table(
+        "trending_buckets",
+        sa.Column("bucket_start", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("post_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("score", sa.Float(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("bucket_start", "post_id"),
+    )
+    op.create_index("ix_trending_buckets_post_id", "trending_buckets", ["post_id"])
+
+
+def downgrade() -> None:
+    """Drop trending score checkpoints."""
+    op.drop_index("ix_trending_buckets_post_id", table_name="trending_buckets")
+    op.drop_table("trending_buckets")
@@ -0,0 +1,150 @@
+"""hash-partitioned likes and comments (shadow tables and sync triggers)
+
+Revision ID: 008_partition_engagement
+Revises: 007_trending_buckets
+Create Date: 2026-10-16
+
+Creates ``likes_partitioned`` and ``comments_partitioned`` (hash-partitioned by
+post_id) next to the live tables, plus triggers that mirror every write on the
+live tables into them. ``python partition.py backfill`` then copies existing rows
+online, and revision 009 swaps the tables.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "008_partition_engagement"
+down_revision: Union[str, None] = "007_trending_buckets"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Fixed at creation; changing it later means another rewrite of both tables
+PARTITIONS = 32
+
+# Trigger functions take the mirror target table as their only argument, so 009
+# can reuse them in the other direction after the swap.
+MIRROR_LIKES = """
+CREATE OR REPLACE FUNCTION mirror_likes() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        EXECUTE format(
+            'INSERT INTO %I (id, post_id, user_id, created_at) VALUES ($1, $2, $3, $4) ON CONFLICT DO NOTHING',
+            TG_ARGV[0]
+        ) USING NEW.id, NEW.post_id, NEW.user_id, NEW.created_at;
+    ELSIF TG_OP = 'DELETE' THEN
+        EXECUTE format('DELETE FROM %I WHERE post_id = $1 AND id = $2', TG_ARGV[0])
+        USING OLD.post_id, OLD.id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+MIRROR_COMMENTS = """
+CREATE OR REPLACE FUNCTION mirror_comments() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        EXECUTE format(
+            'INSERT INTO %I (id, post_id, user_id, content, created_at, is_deleted) '
+            'VALUES ($1, $2, $3, $4, $5, $6) ON CONFLICT DO NOTHING',
+            TG_ARGV[0]
+        ) USING NEW.id, NEW.post_id, NEW.user_id, NEW.content, NEW.created_at, NEW.is_deleted;
+    ELSIF TG_OP = 'UPDATE' THEN
+        EXECUTE format(
+            'UPDATE %I SET user_id = $3, content = $4, created_at = $5, is_deleted = $6 '
+            'WHERE post_id = $1 AND id = $2',
+            TG_ARGV[0]
+        ) USING NEW.post_id, NEW.id, NEW.user_id, NEW.content, NEW.created_at, NEW.is_deleted;
+    ELSE
+        EXECUTE format('DELETE FROM %I WHERE post_id = $1 AND id = $2', TG_ARGV[0])
+        USING OLD.post_id, OLD.id;
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def _create_partitions(table: str) -> None:
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE {table.removesuffix('_partitioned')}_p{remainder:02d} "
+            f"PARTITION OF {table} FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+
+
+def upgrade() -> None:
+    """Create partitioned shadow tables, backfill progress and mirror triggers."""
+    # Keys must include post_id to be enforceable on a hash-partitioned table;
+    # "_p" names avoid clashing with the live tables and are renamed by 009.
+    op.create_table(
+        "likes_partitioned",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("post_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("post_id", "id", name="likes_p_pkey"),
+        sa.UniqueConstraint("post_id", "user_id", name="uq_like_post_user_p"),
+        postgresql_partition_by="HASH (post_id)",
+    )
+    op.create_index("ix_likes_user_post_p", "likes_partitioned", ["user_id", "post_id"])
+    _create_partitions("likes_partitioned")
+
+    op.create_table(
+        "comments_partitioned",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("post_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("is_deleted", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+        sa.PrimaryKeyConstraint("post_id", "id", name="comments_p_pkey"),
+        postgresql_partition_by="HASH (post_id)",
+    )
+    # Comment deletes arrive with only the comment id
+    op.create_index("ix_comments_id_p", "comments_partitioned", ["id"])
+    op.create_index("ix_comments_user_id_p", "comments_partitioned", ["user_id"])
+    op.create_index(
+        "ix_comments_post_live_keyset_p",
+        "comments_partitioned",
+        ["post_id", "created_at", "id"],
+        postgresql_where=sa.text("NOT is_deleted"),
+    )
+    _create_partitions("comments_partitioned")
+
+    op.create_table(
+        "partition_backfill",
+        sa.Column("table_name", sa.Text(), primary_key=True),
+        sa.Column("last_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("copied", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+    )
+    op.execute("INSERT INTO partition_backfill (table_name) VALUES ('likes'), ('comments')")
+
+    op.execute(MIRROR_LIKES)
+    op.execute(MIRROR_COMMENTS)
+    # CREATE TRIGGER waits for in-flight writers, so every row is either
+    # visible to the backfill or mirrored by the trigger
+    op.execute(
+        "CREATE TRIGGER likes_mirror AFTER INSERT OR UPDATE OR DELETE ON likes "
+        "FOR EACH ROW EXECUTE FUNCTION mirror_likes('likes_partitioned')"
+    )
+    op.execute(
+        "CREATE TRIGGER comments_mirror AFTER INSERT OR UPDATE OR DELETE ON comments "
+        "FOR EACH ROW EXECUTE FUNCTION mirror_comments('comments_partitioned')"
+    )
+
+
+def downgrade() -> None:
+    """Drop mirror triggers, backfill progress and the partitioned shadow tables."""
+    op.execute("DROP TRIGGER IF EXISTS comments_mirror ON comments")
+    op.execute("DROP TRIGGER IF EXISTS likes_mirror ON likes")
+    op.execute("DROP FUNCTION IF EXISTS mirror_comments()")
+    op.execute("DROP FUNCTION IF EXISTS mirror_likes()")
+    op.drop_table("partition_backfill")
+    # Dropping the parent drops its partitions
+    op.drop_table("comments_partitioned")
+    op.drop_table("likes_partitioned")
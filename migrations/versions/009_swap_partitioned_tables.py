@@ -0,0 +1,115 @@
+"""swap in the hash-partitioned likes and comments tables
+
+Revision ID: 009_swap_partitioned_tables
+Revises: 008_partition_engagement
+Create Date: 2026-10-16
+
+Requires ``python partition.py backfill`` to have finished (empty tables, as on a
+fresh database, need no backfill). The old tables stay behind as
+``likes_unpartitioned`` / ``comments_unpartitioned`` and keep receiving every
+write through the mirror triggers, so a downgrade is a rename back; drop them
+with ``python partition.py drop-old`` once the new layout is trusted.
+"""
+from typing import List, Sequence, Tuple, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "009_swap_partitioned_tables"
+down_revision: Union[str, None] = "008_partition_engagement"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (live name, shadow name) pairs, plus indexes that only the old layout has
+_LAYOUT = {
+    "likes": {
+        "constraints": [("likes_pkey", "likes_p_pkey"), ("uq_like_post_user", "uq_like_post_user_p")],
+        "indexes": [("ix_likes_user_post", "ix_likes_user_post_p")],
+        "old_only": ["ix_likes_post_id"],
+    },
+    "comments": {
+        "constraints": [("comments_pkey", "comments_p_pkey")],
+        "indexes": [
+            ("ix_comments_user_id", "ix_comments_user_id_p"),
+            ("ix_comments_post_live_keyset", "ix_comments_post_live_keyset_p"),
+        ],
+        "old_only": ["ix_comments_post_id"],
+    },
+}
+_NEW_ONLY = {"likes": [], "comments": [("ix_comments_id", "ix_comments_id_p")]}
+
+
+def _check_backfilled(table: str) -> None:
+    bind = op.get_bind()
+    completed = bind.execute(
+        sa.text("SELECT completed_at FROM partition_backfill WHERE table_name = :table"),
+        {"table": table},
+    ).scalar()
+    has_rows = bind.execute(sa.text(f"SELECT EXISTS (SELECT 1 FROM {table})")).scalar()
+    if completed is None and has_rows:
+        raise RuntimeError(
+            f"{table} has not been copied into {table}_partitioned; "
+            "run `python partition.py backfill` before upgrading past 008"
+        )
+
+
+def _rename(kind: str, table: str, old: str, new: str) -> None:
+    if kind == "constraint":
+        op.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {old} TO {new}")
+    else:
+        op.execute(f"ALTER INDEX {old} RENAME TO {new}")
+
+
+def _pairs(table: str) -> List[Tuple[str, str, str]]:
+    layout = _LAYOUT[table]
+    return [("constraint", live, shadow) for live, shadow in layout["constraints"]] + [
+        ("index", live, shadow) for live, shadow in layout["indexes"]
+    ]
+
+
+def upgrade() -> None:
+    """Rename the partitioned tables into place and mirror writes back to the old ones."""
+    for table in _LAYOUT:
+        _check_backfilled(table)
+    for table, layout in _LAYOUT.items():
+        shadow, old = f"{table}_partitioned", f"{table}_unpartitioned"
+        op.execute(f"LOCK TABLE {table}, {shadow} IN ACCESS EXCLUSIVE MODE")
+        op.execute(f"DROP TRIGGER {table}_mirror ON {table}")
+        op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+        for kind, live_name, shadow_name in _pairs(table):
+            _rename(kind, old, live_name, f"{live_name}_unpartitioned")
+            _rename(kind, shadow, shadow_name, live_name)
+        for name in layout["old_only"]:
+            _rename("index", old, name, f"{name}_unpartitioned")
+        for live_name, shadow_name in _NEW_ONLY[table]:
+            _rename("index", shadow, shadow_name, live_name)
+        op.execute(f"ALTER TABLE {shadow} RENAME TO {table}")
+        op.execute(
+            f"CREATE TRIGGER {table}_mirror AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION mirror_{table}('{old}')"
+        )
+
+
+def downgrade() -> None:
+    """Rename the unpartitioned tables back; fails if ``partition.py drop-old`` already ran."""
+    bind = op.get_bind()
+    for table, layout in _LAYOUT.items():
+        shadow, old = f"{table}_partitioned", f"{table}_unpartitioned"
+        if bind.execute(sa.text("SELECT to_regclass(:name)"), {"name": old}).scalar() is None:
+            raise RuntimeError(f"{old} was dropped; the partitioned {table} table cannot be swapped back")
+        op.execute(f"LOCK TABLE {table}, {old} IN ACCESS EXCLUSIVE MODE")
+        op.execute(f"DROP TRIGGER {table}_mirror ON {table}")
+        op.execute(f"ALTER TABLE {table} RENAME TO {shadow}")
+        for kind, live_name, shadow_name in _pairs(table):
+            _rename(kind, shadow, live_name, shadow_name)
+            _rename(kind, old, f"{live_name}_unpartitioned", live_name)
+        for name in layout["old_only"]:
+            _rename("index", old, f"{name}_unpartitioned", name)
+        for live_name, shadow_name in _NEW_ONLY[table]:
+            _rename("index", shadow, live_name, shadow_name)
+        op.execute(f"ALTER TABLE {old} RENAME TO {table}")
+        op.execute(
+            f"CREATE TRIGGER {table}_mirror AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION mirror_{table}('{shadow}')"
+        )
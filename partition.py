@@ -0,0 +1,69 @@
+"""Move likes and comments onto hash-partitioned tables without downtime.
+
+    alembic upgrade 008_partition_engagement   # shadow tables + mirror triggers
+    python partition.py backfill               # copy existing rows (resumable)
+    python partition.py verify
+    alembic upgrade head                       # 009 swaps the tables
+    python partition.py drop-old               # once the new tables are trusted
+
+``swap-ready`` exits non-zero while 009 would refuse to run; the container
+entrypoint uses it to stop at 008 until the backfill has finished.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from app.db.database import engine
+from app.services.partition_backfill import KINDS, PartitionBackfill
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill the hash-partitioned likes/comments tables")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    backfill = commands.add_parser("backfill", help="Copy existing rows into the partitioned tables")
+    backfill.add_argument("tables", nargs="*", metavar="table", help=f"{' or '.join(KINDS)}; default: both")
+    backfill.add_argument("--chunk-size", type=int, default=5_000, help="Rows copied per transaction")
+    backfill.add_argument("--pause", type=float, default=0.05, help="Seconds to sleep between chunks")
+
+    commands.add_parser("status", help="Show backfill progress")
+    verify = commands.add_parser("verify", help="Compare row counts with the mirror tables")
+    verify.add_argument("tables", nargs="*", metavar="table", help=f"{' or '.join(KINDS)}; default: both")
+    commands.add_parser("swap-ready", help="Exit 1 unless migration 009 can run (backfill done or tables empty)")
+    drop = commands.add_parser("drop-old", help="Drop the *_unpartitioned tables after migration 009")
+    drop.add_argument("--yes", action="store_true", required=True, help="Confirm dropping the old tables")
+    args = parser.parse_args()
+    # choices= with nargs="*" rejects an empty list, so validate table names here
+    unknown = [table for table in getattr(args, "tables", []) if table not in KINDS]
+    if unknown:
+        parser.error(f"invalid table {unknown[0]!r} (choose from {', '.join(KINDS)})")
+    return args
+
+
+async def _main(args: argparse.Namespace) -> int:
+    tool = PartitionBackfill()
+    status = 0
+    try:
+        if args.command == "backfill":
+            tool.chunk_size = args.chunk_size
+            tool.chunk_pause_seconds = args.pause
+            result = [await tool.backfill(kind) for kind in args.tables or KINDS]
+        elif args.command == "status":
+            result = await tool.status()
+        elif args.command == "verify":
+            result = [await tool.verify(kind) for kind in args.tables or KINDS]
+        elif args.command == "swap-ready":
+            result = await tool.swap_ready()
+            status = 0 if all(result.values()) else 1
+        else:
+            result = await tool.drop_old()
+        print(json.dumps(result))
+    finally:
+        await engine.dispose()
+    return status
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s", stream=sys.stderr)
+    sys.exit(asyncio.run(_main(_parse_args())))
@@ -0,0 +1,39 @@
+"""Recompute post counters from likes/comments and repair drift.
+
+    python reconcile.py             # one full pass, fixing drift
+    python reconcile.py --dry-run   # report drift only
+"""
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from app.db.database import engine
+from app.services.counter_reconciler import CounterReconciler
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Reconcile post_content_stats with likes/comments")
+    parser.add_argument("--dry-run", action="store_true", help="Report drifted posts without fixing them")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Posts per transaction")
+    parser.add_argument("--pause", type=float, default=None, help="Seconds to sleep between chunks")
+    return parser.parse_args()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    # A manual pass waits for background reconcilers instead of skipping chunks
+    reconciler = CounterReconciler(wait_for_lock=True)
+    if args.chunk_size is not None:
+        reconciler.chunk_size = args.chunk_size
+    if args.pause is not None:
+        reconciler.chunk_pause_seconds = args.pause
+    try:
+        summary = await reconciler.run_pass(dry_run=args.dry_run)
+        print(json.dumps(summary))
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s", stream=sys.stderr)
+    asyncio.run(_main(_parse_args()))
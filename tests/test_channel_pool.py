@@ -0,0 +1,53 @@
+"""Ordered publishing on the confirm-mode channel pool."""
+import asyncio
+from aio_pika import Message
+from app.messaging.channel_pool import PublisherChannelPool, PublishSkipped, _PublisherChannel
+
+
+class FakeChannel:
+    is_closed = False
+
+
+class FlakyExchange:
+    """Confirms every message except those whose routing key is in ``nack``."""
+
+    def __init__(self, nack):
+        self.nack = set(nack)
+        self.sent = []
+
+    async def publish(self, message, routing_key):
+        self.sent.append(routing_key)
+        await asyncio.sleep(0)
+        if routing_key in self.nack:
+            raise RuntimeError(f"nack {routing_key}")
+
+
+def _pool(exchange, window):
+    pool = PublisherChannelPool("content", size=1, window=window)
+    pool._channels = [_PublisherChannel(FakeChannel(), exchange, window)]
+    return pool
+
+
+def _publish(pool, keys):
+    messages = [(Message(b"{}"), key) for key in keys]
+    return asyncio.run(pool.publish_many(messages, ordering_key="post"))
+
+
+def test_ordered_batch_stops_sending_after_a_failure():
+    exchange = FlakyExchange(nack={"e2"})
+
+    errors = _publish(_pool(exchange, window=1), ["e1", "e2", "e3", "e4"])
+
+    assert exchange.sent == ["e1", "e2"]
+    assert errors[0] is None
+    assert isinstance(errors[1], RuntimeError)
+    assert all(isinstance(error, PublishSkipped) for error in errors[2:])
+
+
+def test_messages_in_flight_behind_a_failure_are_still_reported():
+    exchange = FlakyExchange(nack={"e2"})
+
+    errors = _publish(_pool(exchange, window=8), ["e1", "e2", "e3"])
+
+    assert exchange.sent == ["e1", "e2", "e3"]
+    assert [error is None for error in errors] == [True, False, True]
@@ -0,0 +1,107 @@
+"""GET /posts/{post_id}/comments: uncached render, page-specific ETags and 304s."""
+import asyncio
+from datetime import datetime, timezone
+from uuid import uuid4
+import httpx
+import pytest
+from app.api.routers.engagement import get_read_engagement_service
+from app.core.comment_cache import CommentVersions
+from app.main import app
+from app.schemas.comment import CommentListResponse, CommentResponse
+
+
+class FakeCommentService:
+    """Stands in for EngagementService so the route runs without a database."""
+
+    def __init__(self) -> None:
+        self.versions = CommentVersions(max_size=100, ttl_seconds=60)
+        self.queries = 0
+
+    def comments_version(self, post_id):
+        return self.versions.current(post_id)
+
+    async def list_comments(self, post_id, page, page_size, cursor=None):
+        self.queries += 1
+        comment = CommentResponse(
+            id=uuid4(),
+            post_id=post_id,
+            user_id=uuid4(),
+            content=f"comment on page {page}",
+            created_at=datetime.now(timezone.utc),
+            is_deleted=False,
+        )
+        return CommentListResponse(
+            items=[comment],
+            total=40,
+            page=page,
+            page_size=page_size,
+            has_next=True,
+            has_prev=page > 1,
+        )
+
+
+@pytest.fixture
+def service():
+    fake = FakeCommentService()
+    app.dependency_overrides[get_read_engagement_service] = lambda: fake
+    yield fake
+    app.dependency_overrides.clear()
+
+
+def _get(path, **headers):
+    async def _request():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(path, headers=headers)
+
+    return asyncio.run(_request())
+
+
+def test_uncached_page_renders_with_etag(service):
+    post_id = uuid4()
+    # Page 2 is never served from the first-page cache
+    response = _get(f"/posts/{post_id}/comments?page=2&page_size=5")
+
+    assert response.status_code == 200
+    assert response.json()["items"][0]["content"] == "comment on page 2"
+    assert response.headers["etag"]
+    assert response.headers["cache-control"] == "no-cache"
+    assert service.queries == 1
+
+
+def test_if_none_match_returns_304_without_query(service):
+    post_id = uuid4()
+    first = _get(f"/posts/{post_id}/comments?page=2")
+
+    revalidated = _get(f"/posts/{post_id}/comments?page=2", **{"If-None-Match": first.headers["etag"]})
+
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == first.headers["etag"]
+    assert service.queries == 1
+
+
+def test_pages_of_one_post_have_distinct_etags(service):
+    post_id = uuid4()
+    paths = [
+        f"/posts/{post_id}/comments?page=1&page_size=10",
+        f"/posts/{post_id}/comments?page=2&page_size=10",
+        f"/posts/{post_id}/comments?page=1&page_size=20",
+        f"/posts/{post_id}/comments?cursor=abc&page_size=10",
+    ]
+    etags = [_get(path).headers["etag"] for path in paths]
+    assert len(set(etags)) == len(etags)
+
+    # Page 1's validator must not revalidate page 2
+    response = _get(paths[1], **{"If-None-Match": etags[0]})
+    assert response.status_code == 200
+
+
+def test_version_bump_invalidates_etag(service):
+    post_id = uuid4()
+    first = _get(f"/posts/{post_id}/comments?page=2")
+    service.versions.bump(post_id)
+
+    response = _get(f"/posts/{post_id}/comments?page=2", **{"If-None-Match": first.headers["etag"]})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != first.headers["etag"]
@@ -0,0 +1,14 @@
+"""ConsumerMetrics throughput."""
+from app.messaging.consumer import ConsumerMetrics
+
+
+def test_reading_stats_does_not_reset_throughput():
+    metrics = ConsumerMetrics(window_seconds=10)
+    metrics.record_processed(20)
+    metrics.record_processed()
+
+    first = metrics.stats()
+    second = metrics.stats()
+
+    assert first["processed"] == second["processed"] == 21
+    assert first["throughput_per_second"] == second["throughput_per_second"] == 2.1
@@ -0,0 +1,29 @@
+"""Group commit for likes."""
+import asyncio
+from uuid import uuid4
+import pytest
+from app.services.like_write_buffer import LikeWriteBuffer
+
+
+def test_crashed_flush_fails_the_batch_and_keeps_serving():
+    buffer = LikeWriteBuffer(publisher=None, max_batch=10, max_wait_seconds=0.001, enabled=True)
+    calls = []
+
+    async def flush(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise ConnectionError("connection dropped during rollback")
+        for write in batch:
+            write.future.set_result(None)
+
+    buffer._flush = flush
+
+    async def scenario():
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(buffer.like(uuid4(), uuid4()), 1)
+        assert await asyncio.wait_for(buffer.like(uuid4(), uuid4()), 1) is None
+        await buffer.stop()
+
+    asyncio.run(scenario())
+    assert calls == [1, 1]
+    assert buffer.failed_flushes == 1
@@ -0,0 +1,32 @@
+"""JWT verification and the token cache."""
+import asyncio
+import time
+from uuid import uuid4
+import pytest
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt
+from app.core import security
+from app.core.config import settings
+
+
+def test_unknown_jwt_backend_is_rejected(monkeypatch):
+    monkeypatch.setattr(settings, "jwt_backend", "pyjtw")
+
+    with pytest.raises(ValueError, match="JWT_BACKEND"):
+        security._use_pyjwt()
+
+
+def test_get_current_user_caches_on_the_event_loop():
+    user_id = uuid4()
+    token = jwt.encode(
+        {"sub": str(user_id), "exp": int(time.time()) + 60},
+        settings.jwt_secret_key,
+        algorithm=settings.jwt_algorithm,
+    )
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    async def resolve_many():
+        return await asyncio.gather(*(security.get_current_user(credentials) for _ in range(20)))
+
+    assert asyncio.iscoroutinefunction(security.get_current_user)
+    assert set(asyncio.run(resolve_many())) == {user_id}
@@ -0,0 +1,25 @@
+"""TrendingTracker bucketing."""
+from datetime import datetime, timezone
+from uuid import uuid4
+from app.services.trending import TrendingTracker
+
+
+def test_naive_timestamps_are_read_as_utc():
+    tracker = TrendingTracker(windows="1h", bucket_seconds=60, enabled=True)
+    aware = datetime(2026, 10, 16, 12, 30, tzinfo=timezone.utc)
+
+    assert tracker._index(aware.replace(tzinfo=None)) == tracker._index(aware)
+
+
+def test_unlike_lowers_the_dirty_bucket_score():
+    tracker = TrendingTracker(windows="1h", bucket_seconds=60, refresh_seconds=0, enabled=True)
+    post_id = uuid4()
+    now = datetime.now(timezone.utc)
+    tracker.record(post_id, 1.0, now)
+    tracker.record(post_id, 1.0, now)
+    tracker.record(post_id, -1.0, now)
+
+    rows = tracker._take_dirty()
+
+    assert [(row_post, score) for _, row_post, score in rows] == [(post_id, 1.0)]
+    assert tracker.top("1h", 10) == [(post_id, 1.0)]